@@ -11,10 +11,12 @@ import dash
 import dash_bootstrap_components as dbc
 import flask
 import flask_login
+import plotly.io as pio
 import rollbar
 import rollbar.contrib.flask
 from dash import Input, Output, dcc, html
 from flask import got_request_exception
+from flask_compress import Compress
 from flask_wtf.csrf import CSRFProtect
 
 from auth import login_manager
@@ -30,9 +32,14 @@ from layouts import (
     submit_layout,
     task_detail_layout,
 )
+from services import get_task, open_results_csv
 
 logger = logging.getLogger(__name__)
 
+# Dash serialises every callback response (figures included) through
+# plotly.io.json; pin it to orjson rather than relying on "auto" detection
+pio.json.config.default_engine = "orjson"
+
 # Create Dash app with Bootstrap theme
 app = dash.Dash(
     __name__,
@@ -63,6 +70,14 @@ if not Config.DEBUG:
 server.config["WTF_CSRF_CHECK_DEFAULT"] = False
 csrf = CSRFProtect(server)
 
+# Compress callback responses (grid rows, layouts), which are repetitive
+# JSON.  Streamed responses such as the CSV downloads are left alone so
+# they keep flowing chunk by chunk.
+server.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+server.config["COMPRESS_MIN_SIZE"] = 512
+server.config["COMPRESS_STREAMS"] = False
+Compress(server)
+
 # Initialize Rollbar error tracking
 if Config.ROLLBAR_ACCESS_TOKEN:
     _rollbar_kwargs = dict(
@@ -88,6 +103,32 @@ def health_check():
     return "ok", 200
 
 
+@server.route("/download/<task_id>/<result_type>")
+@flask_login.login_required
+def download_results(task_id, result_type):
+    """Stream a task's result CSV from S3 straight to the browser."""
+    try:
+        _uuid.UUID(task_id)
+    except ValueError:
+        flask.abort(404)
+    user = flask_login.current_user
+    task = get_task(task_id)
+    if task is None or not (
+        user.is_admin or str(task.submitted_by) == str(user.id)
+    ):
+        flask.abort(404)
+
+    csv = open_results_csv(task_id, result_type)
+    if csv is None:
+        flask.abort(404)
+    filename, body = csv
+    return flask.Response(
+        flask.stream_with_context(body.iter_chunks(64 * 1024)),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 # Initialize Flask-Login
 login_manager.init_app(server)
 login_manager.login_view = "/login"
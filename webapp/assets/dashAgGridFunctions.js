@@ -0,0 +1,103 @@
+/**
+ * Custom AG Grid functions for the avoided emissions webapp.
+ *
+ * These are registered as Dash AG Grid functions and referenced by name
+ * in grid and column options (e.g. {function: "taskRowClass(params)"}).
+ */
+
+var dagfuncs = (window.dashAgGridFunctions =
+    window.dashAgGridFunctions || {});
+
+// Row colour class for each status; see the .ae-row-* rules in style.css
+var TASK_ROW_CLASSES = {
+    pending: "ae-row-grey",
+    submitted: "ae-row-yellow",
+    running: "ae-row-blue",
+    succeeded: "ae-row-green",
+    failed: "ae-row-red",
+};
+
+var COVARIATE_ROW_CLASSES = {
+    pending_export: "ae-row-grey",
+    exporting: "ae-row-blue",
+    exported: "ae-row-yellow",
+    pending_merge: "ae-row-grey",
+    merging: "ae-row-blue",
+    merged: "ae-row-green",
+    failed: "ae-row-red",
+    cancelled: "ae-row-red",
+};
+
+/**
+ * taskRowClass – colours a task list row by its status.
+ */
+dagfuncs.taskRowClass = function (params) {
+    return params.data ? TASK_ROW_CLASSES[params.data.status] : undefined;
+};
+
+/**
+ * covariateRowClass – colours a covariate inventory row by its status.
+ *
+ * Covariates without a lifecycle record are green when a COG is already
+ * on S3 and greyed out when nothing has been exported at all.
+ */
+dagfuncs.covariateRowClass = function (params) {
+    var data = params.data;
+    if (!data) {
+        return undefined;
+    }
+    if (data.status) {
+        return COVARIATE_ROW_CLASSES[data.status];
+    }
+    if (data.on_s3) {
+        return "ae-row-green";
+    }
+    return data.gcs_tiles ? undefined : "ae-row-empty";
+};
+
+// Statuses during which a covariate cannot be selected for a bulk action
+var COVARIATE_BUSY_STATUSES = new Set([
+    "pending_export", "exporting", "pending_merge", "merging",
+]);
+
+/**
+ * covariateRowSelectable – a covariate row can be selected once it has
+ * tiles on GCS and is not mid-export or mid-merge.
+ */
+dagfuncs.covariateRowSelectable = function (params) {
+    var data = params.data;
+    return !!data && data.gcs_tiles > 0
+        && !COVARIATE_BUSY_STATUSES.has(data.status);
+};
+
+// Number formatters shared by every numeric column, built once instead of
+// constructing a d3 formatter on every cell render (en-US grouping matches
+// d3's ",.Nf" output)
+var FMT_0 = new Intl.NumberFormat("en-US", {
+    maximumFractionDigits: 0,
+});
+var FMT_1 = new Intl.NumberFormat("en-US", {
+    minimumFractionDigits: 1,
+    maximumFractionDigits: 1,
+});
+
+/**
+ * fmt0 – formats a cell value with thousands separators and no decimals.
+ */
+dagfuncs.fmt0 = function (params) {
+    return FMT_0.format(params.value);
+};
+
+/**
+ * fmt1 – formats a cell value with thousands separators and one decimal.
+ */
+dagfuncs.fmt1 = function (params) {
+    return FMT_1.format(params.value);
+};
+
+/**
+ * fmt1OrBlank – like fmt1, but leaves empty and zero values blank.
+ */
+dagfuncs.fmt1OrBlank = function (params) {
+    return params.value ? FMT_1.format(params.value) : "";
+};
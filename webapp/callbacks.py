@@ -6,10 +6,14 @@ visualization, and admin panel actions.
 """
 
 import base64
-import io
+import collections
+import functools
 import json
 import logging
+import operator
 import os
+import threading
+import time
 import uuid as _uuid
 
 import dash_bootstrap_components as dbc
@@ -27,20 +31,26 @@ from layouts import (
     RESULTS_TOTAL_COLUMNS,
     RESULTS_YEARLY_COLUMNS,
     _make_ag_grid,
+    admin_users_tab,
 )
 from services import (
     approve_user,
+    cache_uploaded_sites,
     change_user_role,
     delete_covariate_preset,
     delete_user,
-    download_results_csv,
     force_reexport,
     force_remerge,
     get_covariate_inventory,
     get_covariate_presets,
     get_task_detail,
-    get_task_list,
+    get_task_list_version,
+    get_task_page,
+    get_task_status,
     get_user_list,
+    get_user_page,
+    load_gee_config,
+    load_uploaded_sites,
     parse_sites_file,
     save_covariate_preset,
     start_gee_export,
@@ -49,6 +59,13 @@ from services import (
 
 logger = logging.getLogger(__name__)
 
+# Bootstrap colour for each task status badge
+STATUS_COLOR = {
+    "pending": "secondary", "submitted": "info",
+    "running": "primary", "succeeded": "success",
+    "failed": "danger", "cancelled": "warning",
+}
+
 
 def _is_valid_uuid(value):
     """Return True if *value* is a valid UUID string."""
@@ -59,28 +76,125 @@ def _is_valid_uuid(value):
         return False
 
 
-def _check_task_access(task_id, user):
-    """Return True if *user* may access the task identified by *task_id*.
+def _can_view_task(task, user):
+    """Return True if *user* may view *task* (admins can view any task)."""
+    return user.is_admin or str(task.submitted_by) == str(user.id)
+
+
+def _task_version(status):
+    """Fingerprints of the data the task detail tabs are rendered from.
 
-    Admins can view any task; regular users can only view their own.
-    Returns False (and logs a warning) for invalid UUIDs or ownership
-    violations.
+    *status* is the dict returned by ``services.get_task_status``.
+    ``"task"`` changes with any status transition; ``"results"`` only when
+    result rows are written, so the result-driven tabs are left alone
+    while a task moves through submitted/running.
     """
-    if not _is_valid_uuid(task_id):
-        return False
-    detail = get_task_detail(task_id)
-    if not detail:
-        return False
-    if user.is_admin:
-        return True
-    return str(detail["task"].submitted_by) == str(user.id)
+    task = status["task"]
+    results = f"{task.id}|{status['n_results']}|{status['n_totals']}"
+    return {
+        "task": (
+            f"{results}|{task.status}|{task.started_at}|{task.completed_at}"
+        ),
+        "results": results,
+    }
+
 
+def _orm_frame(records, fields):
+    """Project ORM *records* onto a DataFrame with one column per field.
 
-def _fmt_dt(dt):
-    """Format a datetime to a short string, or '-' if None."""
-    if dt is None:
-        return "-"
-    return dt.strftime("%Y-%m-%d %H:%M")
+    Attribute access goes through a single ``operator.attrgetter`` so no
+    per-row dict is allocated before pandas sees the data.
+    """
+    return pd.DataFrame.from_records(
+        map(operator.attrgetter(*fields), records), columns=list(fields),
+    )
+
+
+def _ttl_cache(ttl, maxsize=256):
+    """Memoize a function's return value per positional-args key for *ttl* s.
+
+    Used to collapse the interval-driven list refreshes from many open
+    browser tabs into a single DB/API query.  Expired entries are dropped
+    on every insert and at most *maxsize* are kept, so per-window grid
+    keys cannot accumulate.  The wrapped function gains a
+    ``cache_clear()`` method so write callbacks can drop stale entries.
+    """
+    def decorator(func):
+        # Ordered oldest insert first, so expiry and eviction both pop
+        # from the front
+        entries = collections.OrderedDict()
+        lock = threading.Lock()
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            now = time.monotonic()
+            with lock:
+                hit = entries.get(args)
+            if hit is not None and now - hit[0] < ttl:
+                return hit[1]
+            value = func(*args)
+            with lock:
+                entries[args] = (now, value)
+                entries.move_to_end(args)
+                while entries:
+                    oldest = next(iter(entries.values()))
+                    if now - oldest[0] < ttl and len(entries) <= maxsize:
+                        break
+                    entries.popitem(last=False)
+            return value
+
+        def cache_clear():
+            with lock:
+                entries.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+# Keep well below the 15s/30s dcc.Interval polls so the UI never lags by
+# more than one tick.
+_LIST_CACHE_TTL = 5
+
+
+@_ttl_cache(_LIST_CACHE_TTL)
+def _cached_task_page(user_filter, start_row, end_row, sort_json,
+                      filter_json):
+    """One block of grid-ready task rows plus the total, as JSON-safe data.
+
+    The database returns the rows already formatted for display, so a
+    block only needs converting from row tuples to dicts.
+    """
+    tasks, total = get_task_page(
+        user_id=user_filter, start_row=start_row, end_row=end_row,
+        sort_model=json.loads(sort_json), filter_model=json.loads(filter_json),
+    )
+    return [row._asdict() for row in tasks], total
+
+
+@_ttl_cache(_LIST_CACHE_TTL)
+def _cached_user_list():
+    return get_user_list()
+
+
+@_ttl_cache(_LIST_CACHE_TTL)
+def _cached_user_page(start_row, end_row, sort_json, filter_json):
+    """One block of grid-ready admin user rows plus the total."""
+    users, total = get_user_page(
+        start_row=start_row, end_row=end_row,
+        sort_model=json.loads(sort_json), filter_model=json.loads(filter_json),
+    )
+    return [row._asdict() for row in users], total
+
+
+@_ttl_cache(_LIST_CACHE_TTL)
+def _cached_covariate_inventory():
+    return get_covariate_inventory()
+
+
+def _fill_blank(series, default):
+    """Replace None/NaN and empty strings in *series* with *default*."""
+    return series.where(series.notna() & series.astype(bool), default)
 
 
 def _record_covariate_action_failure(covariate_name, action, user_id):
@@ -116,9 +230,61 @@ def _record_covariate_action_failure(covariate_name, action, user_id):
         db.close()
 
 
+def _register_visible_tick(app, interval_id, tick_id):
+    """Forward *interval_id* ticks to the *tick_id* store while visible.
+
+    Polling callbacks listen on the store rather than the interval, so a
+    backgrounded browser tab stops waking the server; the first tick
+    after the tab is shown again resumes refreshing.
+    """
+    app.clientside_callback(
+        """
+        function(n_intervals) {
+            if (document.visibilityState === "hidden") {
+                return window.dash_clientside.no_update;
+            }
+            return n_intervals;
+        }
+        """,
+        Output(tick_id, "data"),
+        Input(interval_id, "n_intervals"),
+        prevent_initial_call=True,
+    )
+
+
+def _register_modal_toggle(app, modal_id, open_id, close_ids):
+    """Open *modal_id* on *open_id* clicks and close it on *close_ids*.
+
+    Runs in the browser, so showing or dismissing the modal needs no
+    server round trip.
+    """
+    app.clientside_callback(
+        """
+        function() {
+            const dc = window.dash_clientside;
+            const triggered = dc.callback_context.triggered;
+            if (!triggered.length) {
+                return dc.no_update;
+            }
+            return triggered[0].prop_id.split(".")[0] === %s;
+        }
+        """ % json.dumps(open_id),
+        Output(modal_id, "is_open"),
+        [Input(open_id, "n_clicks")]
+        + [Input(close_id, "n_clicks") for close_id in close_ids],
+        prevent_initial_call=True,
+    )
+
+
 def register_callbacks(app):
     """Register all Dash callbacks on the app instance."""
 
+    _register_visible_tick(app, "refresh-interval", "refresh-tick")
+    _register_visible_tick(app, "detail-refresh-interval",
+                           "detail-refresh-tick")
+    _register_visible_tick(app, "admin-refresh-interval",
+                           "admin-refresh-tick")
+
     # -- Login ---------------------------------------------------------------
 
     @app.callback(
@@ -186,8 +352,9 @@ def register_callbacks(app):
         if contents is None:
             raise PreventUpdate
 
-        content_type, content_string = contents.split(",")
-        decoded = base64.b64decode(content_string)
+        # Slice past the "data:<type>;base64," header instead of split(),
+        # which would copy the multi-MB payload into a throwaway list first
+        decoded = base64.b64decode(contents[contents.index(",") + 1:])
 
         gdf, errors = parse_sites_file(decoded, filename)
         if errors:
@@ -228,16 +395,13 @@ def register_callbacks(app):
                  "minWidth": 120}
             )
 
-        preview_rows = []
-        for _, row in gdf.iterrows():
-            r = {
-                "site_id": str(row.get("site_id", "")),
-                "site_name": str(row.get("site_name", "")),
-                "start_date": str(row.get("start_date", ""))[:10],
-            }
-            if "end_date" in gdf.columns:
-                r["end_date"] = str(row.get("end_date", ""))[:10]
-            preview_rows.append(r)
+        date_cols = [c for c in ("start_date", "end_date") if c in gdf.columns]
+        preview = pd.DataFrame(
+            gdf[["site_id", "site_name"] + date_cols]
+        ).astype(str)
+        for col in date_cols:
+            preview[col] = preview[col].str.slice(0, 10)
+        preview_rows = preview.to_dict(orient="records")
 
         preview_table = _make_ag_grid(
             "site-preview-table", preview_cols,
@@ -251,8 +415,21 @@ def register_callbacks(app):
             ),
         ])
 
+        # Keep the parsed sites server-side; the browser only holds the key
+        user = get_current_user()
+        try:
+            upload_key = cache_uploaded_sites(gdf, user.id if user else None)
+        except Exception:
+            logger.exception("Caching uploaded sites failed")
+            report_exception()
+            return (
+                html.P("Could not store the uploaded sites. Please try "
+                       "again in a few minutes.", className="text-danger"),
+                None,
+                None,
+            )
         store_data = {
-            "geojson": gdf.to_json(),
+            "key": upload_key,
             "n_sites": len(gdf),
             "filename": filename,
         }
@@ -287,7 +464,10 @@ def register_callbacks(app):
             return "Please log in first.", None
 
         try:
-            gdf = gpd.read_file(io.StringIO(sites_data["geojson"]))
+            gdf = load_uploaded_sites(sites_data.get("key"), user.id)
+            if gdf is None:
+                return ("Uploaded sites have expired. Please upload the file "
+                        "again."), None
             fc_years = list(range(int(fc_start), int(fc_end) + 1))
 
             task_id = submit_analysis_task(
@@ -298,6 +478,7 @@ def register_callbacks(app):
                 covariates=covariates,
                 fc_years=fc_years,
             )
+            _cached_task_page.cache_clear()
 
             return None, dbc.Alert([
                 html.P("Task submitted successfully."),
@@ -311,124 +492,155 @@ def register_callbacks(app):
 
     # -- Dashboard task list (AG Grid) ---------------------------------------
 
+    # The grid uses AG Grid's infinite row model: it requests one block of
+    # rows at a time through getRowsRequest.  The refresh interval only
+    # polls a cheap task-list fingerprint, and the grid re-requests the
+    # blocks it holds only when that fingerprint changes.
+
     @app.callback(
-        [Output("task-list-table", "rowData"),
+        [Output("task-list-table", "getRowsResponse"),
          Output("task-total-count", "children")],
-        [Input("refresh-interval", "n_intervals"),
-         Input("refresh-tasks-btn", "n_clicks")],
+        Input("task-list-table", "getRowsRequest"),
     )
-    def refresh_task_list(_n_intervals, _n_clicks):
+    def load_task_rows(request):
+        if not request:
+            raise PreventUpdate
         user = get_current_user()
         if not user:
             raise PreventUpdate
 
         user_filter = None if user.is_admin else user.id
-        tasks = get_task_list(user_id=user_filter)
+        start_row = request.get("startRow", 0)
+        end_row = request.get("endRow", start_row + 50)
+        rows, total = _cached_task_page(
+            user_filter, start_row, end_row,
+            json.dumps(request.get("sortModel") or [], sort_keys=True),
+            json.dumps(request.get("filterModel") or {}, sort_keys=True),
+        )
 
-        if not tasks:
-            return [], "Total: 0"
+        return {"rowData": rows, "rowCount": total}, f"Total: {total}"
 
-        rows = []
-        for task in tasks:
-            rows.append({
-                "id": str(task.id),
-                "name": task.name,
-                "status": task.status,
-                "n_sites": task.n_sites or 0,
-                "created_at": _fmt_dt(task.created_at),
-                "submitted_at": _fmt_dt(task.submitted_at),
-                "completed_at": _fmt_dt(task.completed_at),
-            })
+    @app.callback(
+        Output("task-list-store", "data"),
+        Input("refresh-tasks-btn", "n_clicks"),
+        prevent_initial_call=True,
+    )
+    def handle_refresh_tasks(n_clicks):
+        # An explicit refresh click always goes to the database
+        _cached_task_page.cache_clear()
+        return n_clicks
 
-        return rows, f"Total: {len(rows)}"
+    @app.callback(
+        [Output("task-list-version", "data"),
+         Output("task-list-changed", "data")],
+        Input("refresh-tick", "data"),
+        State("task-list-version", "data"),
+    )
+    def poll_task_list_version(n, version):
+        user = get_current_user()
+        if not user:
+            raise PreventUpdate
+        current = get_task_list_version(None if user.is_admin else user.id)
+        if current == version:
+            raise PreventUpdate
+        # The first poll on page load only records the version; the grid
+        # is already fetching its initial rows
+        if version is None:
+            return current, no_update
+        _cached_task_page.cache_clear()
+        return current, n
+
+    app.clientside_callback(
+        """
+        function(changed, refreshed) {
+            const api = dash_ag_grid.getApi("task-list-table");
+            if (api) {
+                api.refreshInfiniteCache();
+            }
+            return window.dash_clientside.no_update;
+        }
+        """,
+        Output("task-list-refreshed", "data"),
+        [Input("task-list-changed", "data"),
+         Input("task-list-store", "data")],
+        prevent_initial_call=True,
+    )
 
     # -- Task detail ---------------------------------------------------------
 
+    # The header callback polls a cheap status row and publishes a version
+    # fingerprint; each tab rebuilds only while visible and only when that
+    # version differs from the one it last rendered.
+
     @app.callback(
         [Output("task-title", "children"),
          Output("task-status-badge", "children"),
-         Output("task-overview", "children"),
-         Output("task-results-content", "children"),
-         Output("task-plots", "children"),
-         Output("task-map", "children")],
-        [Input("detail-refresh-interval", "n_intervals"),
-         Input("detail-tabs", "active_tab")],
+         Output("task-detail-version", "data")],
+        Input("detail-refresh-tick", "data"),
         State("task-id-store", "data"),
+        State("task-detail-version", "data"),
     )
-    def refresh_task_detail(n, active_tab, task_id):
+    def refresh_task_header(n, task_id, version):
         if not task_id:
             raise PreventUpdate
 
-        user = get_current_user()
-        if not user or not _check_task_access(task_id, user):
-            return ("Task Not Found", None, None, None, None, None)
-
         # Batch task status is polled by the Celery Beat worker;
         # this callback just reads the current DB state.
-        detail = get_task_detail(task_id)
-        if not detail:
-            return ("Task Not Found", None, None, None, None, None)
-
-        task = detail["task"]
-        sites = detail["sites"]
-        results = detail["results"]
-        totals = detail["totals"]
-
-        # Title and status badge
-        title = task.name
-        status_color = {
-            "pending": "secondary", "submitted": "info",
-            "running": "primary", "succeeded": "success",
-            "failed": "danger", "cancelled": "warning",
-        }.get(task.status, "secondary")
-        badge = dbc.Badge(task.status.upper(), color=status_color,
-                          className="fs-5")
-
-        # Overview tab
-        overview = _build_overview(task, sites, totals)
+        user = get_current_user()
+        status = get_task_status(task_id) if _is_valid_uuid(task_id) else None
+        if not user or not status or not _can_view_task(status["task"], user):
+            return "Task Not Found", None, None
 
-        # Results tab (AG Grid tables)
-        results_content = _build_results_content(results, totals)
+        current = _task_version(status)
+        if current == version:
+            raise PreventUpdate
 
-        # Plots tab
-        plots = _build_plots(results, totals) if results else html.P(
-            "Results not yet available.", className="text-muted"
+        task = status["task"]
+        status_color = STATUS_COLOR.get(task.status, "secondary")
+        badge = dbc.Badge(task.status.upper(), color=status_color,
+                          className="fs-5")
+        return task.name, badge, current
+
+    def _register_task_tab(tab_id, content_id, key_id, depends, build):
+        @app.callback(
+            [Output(content_id, "children"),
+             Output(key_id, "data")],
+            [Input("task-detail-version", "data"),
+             Input("detail-tabs", "active_tab")],
+            State("task-id-store", "data"),
+            State(key_id, "data"),
         )
+        def refresh_task_tab(version, active_tab, task_id, rendered):
+            if not version or active_tab != tab_id:
+                raise PreventUpdate
+            if version[depends] == rendered:
+                raise PreventUpdate
 
-        # Map tab
-        map_content = _build_map(sites, totals)
-
-        return title, badge, overview, results_content, plots, map_content
-
-    # -- Result downloads ----------------------------------------------------
+            user = get_current_user()
+            detail = get_task_detail(task_id) if user else None
+            if not detail or not _can_view_task(detail["task"], user):
+                raise PreventUpdate
+            return build(detail), version[depends]
 
-    @app.callback(
-        Output("download-results", "data"),
-        [Input("download-by-year", "n_clicks"),
-         Input("download-totals", "n_clicks")],
-        State("task-id-store", "data"),
-        prevent_initial_call=True,
+    _register_task_tab(
+        "tab-overview", "task-overview", "task-overview-key", "task",
+        lambda d: _build_overview(d["task"], d["sites"], d["totals"]),
+    )
+    _register_task_tab(
+        "tab-results", "task-results-content", "task-results-key", "results",
+        lambda d: _build_results_content(
+            d["task"].id, d["results"], d["totals"],
+        ),
+    )
+    _register_task_tab(
+        "tab-plots", "task-plots", "task-plots-key", "results",
+        lambda d: _build_plots(d["results"], d["totals"]) if d["results"]
+        else html.P("Results not yet available.", className="text-muted"),
+    )
+    _register_task_tab(
+        "tab-map", "task-map", "task-map-key", "results",
+        lambda d: _build_map(d["sites"], d["totals"]),
     )
-    def handle_download(by_year_clicks, total_clicks, task_id):
-        ctx = callback_context
-        if not ctx.triggered:
-            raise PreventUpdate
-
-        user = get_current_user()
-        if not user or not _check_task_access(task_id, user):
-            raise PreventUpdate
-
-        trigger_id = ctx.triggered[0]["prop_id"].split(".")[0]
-        if trigger_id == "download-by-year":
-            csv = download_results_csv(task_id, "by_site_year")
-            filename = "results_by_site_year.csv"
-        else:
-            csv = download_results_csv(task_id, "by_site_total")
-            filename = "results_by_site_total.csv"
-
-        if csv:
-            return dict(content=csv, filename=filename)
-        return no_update
 
     # -- Admin: Covariates (unified export + merge) ---------------------------
 
@@ -443,18 +655,7 @@ def register_callbacks(app):
         if not user or not user.is_admin:
             return dbc.Alert("Admin access required.", color="danger")
 
-        import importlib.util
-        import os
-
-        gee_config_path = os.path.join(
-            os.path.dirname(__file__), "gee-export", "config.py"
-        )
-        spec = importlib.util.spec_from_file_location(
-            "gee_export_config", gee_config_path
-        )
-        gee_config = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(gee_config)
-        COVARIATES = gee_config.COVARIATES
+        COVARIATES = load_gee_config().COVARIATES
 
         if category == "all":
             names = list(COVARIATES.keys())
@@ -468,6 +669,7 @@ def register_callbacks(app):
 
         try:
             export_ids = start_gee_export(names, user.id)
+            _cached_covariate_inventory.cache_clear()
             return dbc.Alert(
                 f"Started {len(export_ids)} GEE export task(s).",
                 color="success",
@@ -483,15 +685,21 @@ def register_callbacks(app):
     @app.callback(
         [Output("covariates-table", "rowData"),
          Output("covariates-total-count", "children")],
-        [Input("admin-refresh-interval", "n_intervals"),
+        [Input("admin-refresh-tick", "data"),
          Input("gee-export-result", "children"),
          Input("covariate-action-result", "children")],
     )
     def refresh_covariate_inventory(n, _export_result, _action_result):
         # GEE export status is polled by the Celery Beat worker;
         # this callback just reads the current DB/S3/GCS state.
+        # Export/row actions change the inventory; don't serve a stale copy
+        ctx = callback_context
+        trigger = (ctx.triggered[0]["prop_id"].split(".")[0]
+                   if ctx.triggered else None)
+        if trigger in ("gee-export-result", "covariate-action-result"):
+            _cached_covariate_inventory.cache_clear()
         try:
-            rows = get_covariate_inventory()
+            rows = _cached_covariate_inventory()
         except Exception:
             logger.exception("Failed to build covariate inventory")
             report_exception()
@@ -568,46 +776,75 @@ def register_callbacks(app):
     # -- Admin: User management (AG Grid) ------------------------------------
 
     @app.callback(
-        [Output("user-management-table", "rowData"),
+        [Output("tab-users-content", "children"),
+         Output("tab-users-built", "data")],
+        Input("admin-tabs", "active_tab"),
+        State("tab-users-built", "data"),
+        prevent_initial_call=True,
+    )
+    def mount_users_tab(active_tab, built):
+        # Mount once; later tab switches keep the existing subtree
+        if active_tab != "tab-users" or built:
+            raise PreventUpdate
+        return admin_users_tab(), True
+
+    # Same infinite row model as the dashboard: the grid requests blocks
+    # through getRowsRequest and the admin refresh interval (also bumped
+    # by the user actions below) re-requests the blocks it holds.
+
+    @app.callback(
+        [Output("user-management-table", "getRowsResponse"),
          Output("user-management-total-count", "children")],
-        Input("admin-refresh-interval", "n_intervals"),
+        Input("user-management-table", "getRowsRequest"),
+    )
+    def load_user_rows(request):
+        if not request:
+            raise PreventUpdate
+        user = get_current_user()
+        if not user or not user.is_admin:
+            raise PreventUpdate
+
+        start_row = request.get("startRow", 0)
+        end_row = request.get("endRow", start_row + 100)
+        rows, total = _cached_user_page(
+            start_row, end_row,
+            json.dumps(request.get("sortModel") or [], sort_keys=True),
+            json.dumps(request.get("filterModel") or {}, sort_keys=True),
+        )
+        return {"rowData": rows, "rowCount": total}, f"Total: {total}"
+
+    app.clientside_callback(
+        """
+        function(n_intervals) {
+            const api = dash_ag_grid.getApi("user-management-table");
+            if (api) {
+                api.refreshInfiniteCache();
+            }
+            return window.dash_clientside.no_update;
+        }
+        """,
+        Output("user-management-refreshed", "data"),
+        Input("admin-refresh-tick", "data"),
+        prevent_initial_call=True,
     )
-    def refresh_user_management(n):
-        users = get_user_list()
-        if not users:
-            return [], "Total: 0"
-
-        rows = []
-        for u in users:
-            rows.append({
-                "id": str(u.id),
-                "name": u.name,
-                "email": u.email,
-                "role": u.role,
-                "is_approved": u.is_approved,
-                "created_at": _fmt_dt(u.created_at),
-                "last_login": _fmt_dt(u.last_login),
-                "is_active": u.is_active,
-            })
-
-        return rows, f"Total: {len(rows)}"
 
     # -- Admin: populate user select dropdown --------------------------------
 
     @app.callback(
         Output("admin-user-select", "options"),
-        Input("user-management-table", "rowData"),
+        Input("admin-refresh-tick", "data"),
     )
-    def update_user_select(row_data):
-        if not row_data:
-            return []
+    def update_user_select(n):
+        user = get_current_user()
+        if not user or not user.is_admin:
+            raise PreventUpdate
         return [
             {
-                "label": f"{r['name']} ({r['email']})"
-                         + (" [pending]" if not r.get("is_approved") else ""),
-                "value": r["id"],
+                "label": f"{name} ({email})"
+                         + (" [pending]" if not is_approved else ""),
+                "value": str(user_id),
             }
-            for r in row_data
+            for user_id, name, email, is_approved in _cached_user_list()
         ]
 
     # -- Settings: link trends.earth account ---------------------------------
@@ -765,12 +1002,14 @@ def register_callbacks(app):
 
         from config import Config
         from credential_store import (
+            decrypt_secret,
             delete_credential,
             get_credential,
-            get_decrypted_secret,
         )
         from trendsearth_client import TrendsEarthClient
 
+        # Look up and decrypt first, so no DB session is held open across
+        # the call to the trends.earth API
         cred = get_credential(user.id)
         if not cred:
             return dbc.Alert("No linked account.", color="info", duration=4000)
@@ -778,15 +1017,12 @@ def register_callbacks(app):
         # Try to revoke on the API side (best-effort)
         if cred.api_client_db_id:
             try:
-                creds = get_decrypted_secret(user.id)
-                if creds:
-                    client_id, client_secret = creds
-                    client = TrendsEarthClient.from_oauth2_credentials(
-                        api_url=Config.TRENDSEARTH_API_URL,
-                        client_id=client_id,
-                        client_secret=client_secret,
-                    )
-                    client.revoke_oauth2_client(cred.api_client_db_id)
+                client = TrendsEarthClient.from_oauth2_credentials(
+                    api_url=Config.TRENDSEARTH_API_URL,
+                    client_id=cred.client_id,
+                    client_secret=decrypt_secret(cred.client_secret_encrypted),
+                )
+                client.revoke_oauth2_client(cred.api_client_db_id)
             except Exception:
                 logger.warning(
                     "Failed to revoke OAuth2 client on API (continuing "
@@ -819,6 +1055,8 @@ def register_callbacks(app):
             return dbc.Alert("Admin access required.", color="danger",
                              duration=4000), no_update
         success, message = approve_user(user_id)
+        _cached_user_list.cache_clear()
+        _cached_user_page.cache_clear()
         color = "success" if success else "danger"
         # Bump n_intervals to force a refresh of the user table
         return dbc.Alert(message, color=color, duration=4000), (current_n or 0) + 1
@@ -843,28 +1081,15 @@ def register_callbacks(app):
             return dbc.Alert("Admin access required.", color="danger",
                              duration=4000), no_update
         success, message = change_user_role(user_id, new_role)
+        _cached_user_list.cache_clear()
+        _cached_user_page.cache_clear()
         color = "success" if success else "danger"
         return dbc.Alert(message, color=color, duration=4000), (current_n or 0) + 1
 
     # -- Admin: delete user (modal) ------------------------------------------
 
-    @app.callback(
-        Output("admin-delete-modal", "is_open"),
-        [Input("admin-delete-btn", "n_clicks"),
-         Input("admin-delete-cancel", "n_clicks"),
-         Input("admin-delete-confirm", "n_clicks")],
-        State("admin-delete-modal", "is_open"),
-        prevent_initial_call=True,
-    )
-    def toggle_admin_delete_modal(open_clicks, cancel_clicks, confirm_clicks,
-                                  is_open):
-        ctx = callback_context
-        if not ctx.triggered:
-            raise PreventUpdate
-        trigger = ctx.triggered[0]["prop_id"].split(".")[0]
-        if trigger == "admin-delete-btn":
-            return True
-        return False
+    _register_modal_toggle(app, "admin-delete-modal", "admin-delete-btn",
+                           ["admin-delete-cancel", "admin-delete-confirm"])
 
     @app.callback(
         [Output("admin-user-action-result", "children", allow_duplicate=True),
@@ -887,28 +1112,15 @@ def register_callbacks(app):
             return dbc.Alert("You cannot delete your own admin account.",
                              color="warning", duration=4000), no_update
         success, message = delete_user(user_id)
+        _cached_user_list.cache_clear()
+        _cached_user_page.cache_clear()
         color = "success" if success else "danger"
         return dbc.Alert(message, color=color, duration=4000), (current_n or 0) + 1
 
     # -- Self account deletion (modal) ---------------------------------------
 
-    @app.callback(
-        Output("self-delete-modal", "is_open"),
-        [Input("self-delete-btn", "n_clicks"),
-         Input("self-delete-cancel", "n_clicks"),
-         Input("self-delete-confirm", "n_clicks")],
-        State("self-delete-modal", "is_open"),
-        prevent_initial_call=True,
-    )
-    def toggle_self_delete_modal(open_clicks, cancel_clicks, confirm_clicks,
-                                 is_open):
-        ctx = callback_context
-        if not ctx.triggered:
-            raise PreventUpdate
-        trigger = ctx.triggered[0]["prop_id"].split(".")[0]
-        if trigger == "self-delete-btn":
-            return True
-        return False
+    _register_modal_toggle(app, "self-delete-modal", "self-delete-btn",
+                           ["self-delete-cancel", "self-delete-confirm"])
 
     @app.callback(
         Output("self-delete-result", "children"),
@@ -920,6 +1132,8 @@ def register_callbacks(app):
         if not user:
             raise PreventUpdate
         success, message = delete_user(user.id)
+        _cached_user_list.cache_clear()
+        _cached_user_page.cache_clear()
         if success:
             flask_login.logout_user()
             return dcc.Location(pathname="/login", id="redirect-after-delete")
@@ -969,7 +1183,7 @@ def register_callbacks(app):
         prevent_initial_call=True,
     )
     def load_preset(_n, preset_id, presets_data):
-        """Set the checklist values to the covariates in the selected preset."""
+        """Set the selected covariates to those in the chosen preset."""
         if not preset_id or not presets_data:
             return no_update, "Please select a preset to load."
 
@@ -1096,13 +1310,14 @@ def _build_overview(task, sites, totals):
 
     # Summary stats if results exist
     if totals:
-        total_emissions = sum(
-            t.emissions_avoided_mgco2e or 0 for t in totals
-        )
-        total_forest = sum(
-            t.forest_loss_avoided_ha or 0 for t in totals
-        )
-        total_area = sum(t.area_ha or 0 for t in totals)
+        # One pass over the ORM rows, then NaN-skipping column sums in C
+        sums = _orm_frame(
+            totals,
+            ["emissions_avoided_mgco2e", "forest_loss_avoided_ha", "area_ha"],
+        ).astype("float64").sum()
+        total_emissions = sums["emissions_avoided_mgco2e"]
+        total_forest = sums["forest_loss_avoided_ha"]
+        total_area = sums["area_ha"]
 
         cards.append(dbc.Row([
             dbc.Col(dbc.Card([
@@ -1132,13 +1347,21 @@ def _build_overview(task, sites, totals):
 
     # Sites table (AG Grid)
     if sites:
-        site_rows = [{
-            "site_id": s.site_id,
-            "site_name": s.site_name or "-",
-            "start_date": str(s.start_date)[:10] if s.start_date else "-",
-            "end_date": str(s.end_date)[:10] if s.end_date else "Ongoing",
-            "area_ha": s.area_ha,
-        } for s in sites]
+        df_sites = _orm_frame(
+            sites,
+            ["site_id", "site_name", "start_date", "end_date", "area_ha"],
+        )
+        df_sites["site_name"] = _fill_blank(df_sites["site_name"], "-")
+        for col, missing in (("start_date", "-"), ("end_date", "Ongoing")):
+            df_sites[col] = (
+                pd.to_datetime(df_sites[col], errors="coerce")
+                .dt.strftime("%Y-%m-%d").fillna(missing)
+            )
+        # Keep missing areas as JSON null rather than NaN
+        df_sites["area_ha"] = df_sites["area_ha"].astype(object).where(
+            df_sites["area_ha"].notna(), None,
+        )
+        site_rows = df_sites.to_dict(orient="records")
 
         site_cols = [
             {"headerName": "Site ID", "field": "site_id", "flex": 1,
@@ -1151,7 +1374,7 @@ def _build_overview(task, sites, totals):
              "minWidth": 110},
             {"headerName": "Area (ha)", "field": "area_ha", "flex": 1,
              "minWidth": 100, "type": "numericColumn",
-             "valueFormatter": {"function": "d3.format(',.0f')(params.value)"}},
+             "valueFormatter": {"function": "fmt0(params)"}},
         ]
 
         cards.append(dbc.Card([
@@ -1167,32 +1390,41 @@ def _build_overview(task, sites, totals):
     return html.Div(cards)
 
 
-def _build_results_content(results, totals):
+def _build_results_content(task_id, results, totals):
     """Build the results section with AG Grid tables and download buttons."""
     if not totals:
         return html.P("Results not yet available.", className="text-muted")
 
     # Totals table
-    totals_rows = [{
-        "site_id": t.site_id,
-        "site_name": t.site_name or "-",
-        "emissions_avoided_mgco2e": t.emissions_avoided_mgco2e or 0,
-        "forest_loss_avoided_ha": t.forest_loss_avoided_ha or 0,
-        "area_ha": t.area_ha or 0,
-        "period": (f"{t.first_year}-{t.last_year}"
-                   if t.first_year else "-"),
-    } for t in totals]
+    value_cols = ["emissions_avoided_mgco2e", "forest_loss_avoided_ha"]
+    df_totals = _orm_frame(
+        totals,
+        ["site_id", "site_name"] + value_cols
+        + ["area_ha", "first_year", "last_year"],
+    )
+    df_totals["site_name"] = _fill_blank(df_totals["site_name"], "-")
+    df_totals[value_cols + ["area_ha"]] = (
+        df_totals[value_cols + ["area_ha"]].fillna(0)
+    )
+    first = df_totals.pop("first_year").astype("Int64")
+    last = df_totals.pop("last_year").astype("Int64")
+    df_totals["period"] = (
+        (first.astype(str) + "-" + last.astype(str))
+        .where(first.fillna(0) != 0, "-")
+    )
+    totals_rows = df_totals.to_dict(orient="records")
 
     # Yearly results table
     yearly_rows = []
     if results:
-        yearly_rows = [{
-            "site_id": r.site_id,
-            "year": r.year,
-            "emissions_avoided_mgco2e": r.emissions_avoided_mgco2e or 0,
-            "forest_loss_avoided_ha": r.forest_loss_avoided_ha or 0,
-            "n_matched_pixels": r.n_matched_pixels or 0,
-        } for r in results]
+        df_yearly = _orm_frame(
+            results, ["site_id", "year"] + value_cols + ["n_matched_pixels"],
+        )
+        df_yearly[value_cols] = df_yearly[value_cols].fillna(0)
+        df_yearly["n_matched_pixels"] = (
+            df_yearly["n_matched_pixels"].fillna(0).astype("int64")
+        )
+        yearly_rows = df_yearly.to_dict(orient="records")
 
     content = [
         html.H5("Totals by Site"),
@@ -1212,15 +1444,16 @@ def _build_results_content(results, totals):
         ])
 
     content.extend([
+        # Plain links to a streaming Flask route, so the CSV goes from S3
+        # to the browser without passing through a Dash callback payload
         dbc.ButtonGroup([
-            dbc.Button("Download CSV (by year)",
-                       id="download-by-year", color="secondary",
-                       size="sm"),
-            dbc.Button("Download CSV (totals)",
-                       id="download-totals", color="secondary",
-                       size="sm"),
+            html.A("Download CSV (by year)",
+                   href=f"/download/{task_id}/by_site_year",
+                   className="btn btn-secondary btn-sm"),
+            html.A("Download CSV (totals)",
+                   href=f"/download/{task_id}/by_site_total",
+                   className="btn btn-secondary btn-sm"),
         ], className="mt-3"),
-        dcc.Download(id="download-results"),
     ])
 
     return html.Div(content)
@@ -1231,13 +1464,11 @@ def _build_plots(results, totals):
     if not results:
         return html.P("No results to plot.", className="text-muted")
 
+    value_cols = ["emissions_avoided_mgco2e", "forest_loss_avoided_ha"]
+
     # Convert to DataFrame
-    df = pd.DataFrame([{
-        "site_id": r.site_id,
-        "year": r.year,
-        "emissions_avoided_mgco2e": r.emissions_avoided_mgco2e or 0,
-        "forest_loss_avoided_ha": r.forest_loss_avoided_ha or 0,
-    } for r in results])
+    df = _orm_frame(results, ["site_id", "year"] + value_cols)
+    df[value_cols] = df[value_cols].fillna(0)
 
     plots = []
 
@@ -1252,7 +1483,7 @@ def _build_plots(results, totals):
         },
     )
     fig_emissions.update_layout(barmode="stack")
-    plots.append(dcc.Graph(figure=fig_emissions))
+    plots.append(dcc.Graph(figure=fig_emissions.to_plotly_json()))
 
     # Forest loss avoided over time
     fig_forest = px.bar(
@@ -1265,16 +1496,15 @@ def _build_plots(results, totals):
         },
     )
     fig_forest.update_layout(barmode="stack")
-    plots.append(dcc.Graph(figure=fig_forest))
+    plots.append(dcc.Graph(figure=fig_forest.to_plotly_json()))
 
     # Per-site totals bar chart
     if totals:
-        df_totals = pd.DataFrame([{
-            "site_id": t.site_id,
-            "site_name": t.site_name or t.site_id,
-            "emissions_avoided_mgco2e": t.emissions_avoided_mgco2e or 0,
-            "forest_loss_avoided_ha": t.forest_loss_avoided_ha or 0,
-        } for t in totals])
+        df_totals = _orm_frame(totals, ["site_id", "site_name"] + value_cols)
+        df_totals[value_cols] = df_totals[value_cols].fillna(0)
+        df_totals["site_name"] = _fill_blank(
+            df_totals["site_name"], df_totals["site_id"],
+        )
 
         fig_site_totals = px.bar(
             df_totals, x="site_name", y="emissions_avoided_mgco2e",
@@ -1284,7 +1514,7 @@ def _build_plots(results, totals):
                 "site_name": "Site",
             },
         )
-        plots.append(dcc.Graph(figure=fig_site_totals))
+        plots.append(dcc.Graph(figure=fig_site_totals.to_plotly_json()))
 
     return html.Div(plots)
 
@@ -1294,26 +1524,32 @@ def _build_map(sites, totals):
     if not sites:
         return html.P("No site geometries available.", className="text-muted")
 
-    totals_dict = {}
+    df_map = _orm_frame(sites, ["site_id", "site_name"])
+    emissions = pd.Series(dtype="float64")
     if totals:
-        totals_dict = {t.site_id: t for t in totals}
-
-    lats, lons, texts, colors = [], [], [], []
-    for s in sites:
-        lats.append(0)
-        lons.append(0)
-        t = totals_dict.get(s.site_id)
-        emissions = t.emissions_avoided_mgco2e if t else 0
-        texts.append(
-            f"{s.site_name or s.site_id}<br>"
-            f"Emissions avoided: {emissions:,.0f} MgCO₂e"
+        df_totals = _orm_frame(totals, ["site_id", "emissions_avoided_mgco2e"])
+        emissions = (
+            df_totals.drop_duplicates("site_id", keep="last")
+            .set_index("site_id")["emissions_avoided_mgco2e"]
         )
-        colors.append(emissions or 0)
+    df_map["emissions"] = (
+        df_map["site_id"].map(emissions).astype("float64").fillna(0)
+    )
+    texts = (
+        _fill_blank(df_map["site_name"], df_map["site_id"]).astype(str)
+        + "<br>Emissions avoided: "
+        + df_map["emissions"].map("{:,.0f}".format)
+        + " MgCO₂e"
+    )
+    # Site geometries are not loaded yet, so every marker sits at 0, 0
+    coords = pd.Series(0.0, index=df_map.index).to_numpy()
 
+    # Scattermapbox is already WebGL-rendered; hand it flat arrays so
+    # Plotly doesn't validate per-point values.
     fig = go.Figure(go.Scattermapbox(
-        lat=lats, lon=lons, text=texts,
-        marker=dict(size=10, color=colors, colorscale="Greens",
-                    showscale=True),
+        lat=coords, lon=coords, text=texts.to_numpy(),
+        marker=dict(size=10, color=df_map["emissions"].to_numpy(),
+                    colorscale="Greens", showscale=True),
         hoverinfo="text",
     ))
     fig.update_layout(
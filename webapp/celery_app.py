@@ -48,16 +48,23 @@ celery_app = Celery(
 )
 
 celery_app.conf.update(
-    # Serialisation
-    task_serializer="json",
-    result_serializer="json",
-    accept_content=["json"],
+    # Serialisation — msgpack is faster and more compact than JSON; JSON
+    # is still accepted so messages queued by older workers drain cleanly.
+    task_serializer="msgpack",
+    result_serializer="msgpack",
+    accept_content=["msgpack", "json"],
     # Timezone
     timezone="UTC",
     enable_utc=True,
-    # Reliability
+    # Reliability.  The prefetch multiplier here is the default for the
+    # heavy merge worker; the polling worker raises it on its command line
+    # (see deploy/docker-compose.*.yml).
     task_acks_late=True,
     worker_prefetch_multiplier=1,
+    # With acks_late, Redis re-delivers any task not acknowledged within the
+    # visibility timeout.  COG merges of large covariates can run for hours,
+    # so keep this well above the longest merge to avoid duplicate runs.
+    broker_transport_options={"visibility_timeout": 6 * 3600},
     # Result expiry (24 h)
     result_expires=86400,
     # Autodiscover tasks in the 'tasks' module
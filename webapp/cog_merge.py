@@ -1,13 +1,17 @@
 """Merge GEE-exported covariate tiles into single Cloud-Optimized GeoTIFFs.
 
 GEE splits global exports into multiple tiles when the image exceeds the
-32,768-pixel dimension limit.  This module downloads all tiles for a given
-covariate from GCS, merges them into one COG with lossless compression using
-GDAL, and uploads the result to S3.
+32,768-pixel dimension limit.  This module reads all tiles for a given
+covariate from GCS (streamed through GDAL's ``/vsicurl/`` driver, or
+downloaded when only the GDAL CLI is available), merges them into one COG
+with lossless compression, and uploads the result to S3.
 
 Requirements (already installed in webapp Dockerfile):
-    * gdal-bin  — provides ``gdalbuildvrt`` and ``gdal_translate``
+    * GDAL Python bindings (``osgeo.gdal``) — in-process VRT mosaic and COG
+      translation; ``gdal-bin``'s ``gdalbuildvrt``/``gdal_translate`` are
+      used as a fallback when the bindings are unavailable
     * requests  — for downloading tiles from public GCS URLs
+    * httpx     — HTTP/2 client for GCS JSON API listings
     * boto3     — for uploading merged COGs to S3
 
 Usage from the web application is through the service layer
@@ -15,17 +19,139 @@ Usage from the web application is through the service layer
 ``merge_covariate_tiles()`` in a background thread.
 """
 
+import collections
+import json
 import logging
 import os
+import re
 import shutil
 import subprocess
 import tempfile
+import time
+import urllib.parse
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 import boto3
 import requests
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of tiles downloaded concurrently per merge
+MAX_DOWNLOAD_WORKERS = 16
+
+# Read/write block size when streaming a tile to disk
+DOWNLOAD_BUFFER_SIZE = 256 * 1024
+
+# Multipart settings for uploading merged COGs (often several GiB) to S3
+S3_UPLOAD_CONFIG = TransferConfig(
+    multipart_threshold=64 * 1024 * 1024,
+    multipart_chunksize=64 * 1024 * 1024,
+    max_concurrency=16,
+    use_threads=True,
+)
+
+_http_session = None
+
+
+def _get_http_session() -> requests.Session:
+    """Return the shared keep-alive session used for GCS object requests.
+
+    Reusing one session keeps TLS connections open across batch deletes
+    and concurrent downloads.  Transient GCS errors (429/5xx) are retried
+    with backoff.
+    """
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        retries = Retry(
+            total=3, backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+        )
+        adapter = HTTPAdapter(
+            pool_connections=32, pool_maxsize=64, max_retries=retries,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _http_session = session
+    return _http_session
+
+
+@lru_cache(maxsize=8)
+def _s3_client(region: str):
+    """Return a cached boto3 S3 client for *region*.
+
+    Client construction loads the service model and resolves credentials
+    and endpoints, so clients are built once per region and shared (boto3
+    clients are thread-safe).
+    """
+    return boto3.client("s3", region_name=region)
+
+
+@lru_cache(maxsize=1)
+def _gcs_default_credentials():
+    """Return the (cached) default Google credentials for GCS writes."""
+    import google.auth
+
+    credentials, _project = google.auth.default(
+        scopes=["https://www.googleapis.com/auth/devstorage.full_control"]
+    )
+    return credentials
+
+
+def _get_gcs_credentials():
+    """Return refreshed default Google credentials for GCS writes.
+
+    The credentials object is cached and only refreshed once its access
+    token has expired.  Raises if no default credentials are available.
+    """
+    import google.auth.transport.requests
+
+    credentials = _gcs_default_credentials()
+    if not credentials.valid:
+        credentials.refresh(google.auth.transport.requests.Request())
+    return credentials
+
+
+# Statuses on which GCS JSON API listing calls are retried
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@lru_cache(maxsize=1)
+def _get_gcs_api_client():
+    """Return the shared HTTP/2 client used for GCS JSON API listings.
+
+    Paginated and sharded listings all go to ``storage.googleapis.com``;
+    over HTTP/2 the concurrent requests are multiplexed on a few
+    connections with compressed headers.
+    """
+    import httpx
+
+    transport = httpx.HTTPTransport(
+        http2=True, retries=3,
+        limits=httpx.Limits(max_connections=32,
+                            max_keepalive_connections=32),
+    )
+    return httpx.Client(transport=transport, timeout=60)
+
+
+def _gcs_api_get(url: str, params: dict) -> dict:
+    """GET a GCS JSON API listing page, retrying transient errors."""
+    client = _get_gcs_api_client()
+    for attempt in range(4):
+        resp = client.get(url, params=params)
+        if resp.status_code not in _RETRY_STATUSES or attempt == 3:
+            break
+        time.sleep(0.3 * 2 ** attempt)
+    resp.raise_for_status()
+    return resp.json()
+
+
 # ---------------------------------------------------------------------------
 # GCS helpers
 # ---------------------------------------------------------------------------
@@ -36,32 +162,79 @@ def list_gcs_tiles(bucket: str, prefix: str, covariate_name: str) -> list[str]:
     Uses the public GCS JSON API (no credentials needed for public buckets).
     """
     obj_prefix = f"{prefix}/{covariate_name}".strip("/")
-    api_url = (
-        f"https://storage.googleapis.com/storage/v1/b/{bucket}/o"
-        f"?prefix={obj_prefix}&maxResults=1000"
-    )
-    resp = requests.get(api_url, timeout=30)
-    resp.raise_for_status()
-    items = []
-    page_token = None
+    urls = [
+        f"https://storage.googleapis.com/{bucket}/{name}"
+        for name in _list_gcs_object_names(bucket, obj_prefix)
+        if name.endswith(".tif")
+    ]
+    return sorted(urls)
+
+
+# Number of concurrent key-range listings used by list_all_gcs_tiles
+GCS_LIST_SHARDS = 8
+
+
+def _list_gcs_items(bucket: str, prefix: str, fields: str = "name",
+                    start_offset: str | None = None,
+                    end_offset: str | None = None) -> list[dict]:
+    """List object resources under *prefix*, optionally within a key range.
+
+    Only the comma-separated object *fields* are requested from the API.
+    ``start_offset`` is inclusive and ``end_offset`` exclusive, as in the
+    GCS JSON API.
+    """
+    api_url = f"https://storage.googleapis.com/storage/v1/b/{bucket}/o"
+    params = {
+        "prefix": prefix,
+        "maxResults": 1000,
+        "fields": f"items({fields}),nextPageToken",
+    }
+    if start_offset:
+        params["startOffset"] = start_offset
+    if end_offset:
+        params["endOffset"] = end_offset
+
+    items: list[dict] = []
     while True:
-        url = api_url
-        if page_token:
-            url += f"&pageToken={page_token}"
-        resp = requests.get(url, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
+        data = _gcs_api_get(api_url, params)
         items.extend(data.get("items", []))
         page_token = data.get("nextPageToken")
         if not page_token:
             break
+        params["pageToken"] = page_token
+    return items
 
-    urls = [
-        f"https://storage.googleapis.com/{bucket}/{item['name']}"
-        for item in items
-        if item["name"].endswith(".tif")
-    ]
-    return sorted(urls)
+
+def _list_gcs_object_names(bucket: str, prefix: str,
+                           start_offset: str | None = None,
+                           end_offset: str | None = None) -> list[str]:
+    """List object names under *prefix*, optionally within a key range."""
+    items = _list_gcs_items(bucket, prefix, "name", start_offset, end_offset)
+    return [item["name"] for item in items]
+
+
+def list_gcs_tile_manifest(bucket: str, prefix: str,
+                           covariate_name: str) -> list[dict]:
+    """Return the ``.tif`` tiles of a covariate with their GCS generation.
+
+    Each entry is ``{"name", "generation", "size"}``, sorted by name.  The
+    generation changes whenever an object is rewritten, so two equal
+    manifests describe exactly the same tile contents.
+    """
+    obj_prefix = f"{prefix}/{covariate_name}".strip("/")
+    items = _list_gcs_items(bucket, obj_prefix, "name,generation,size")
+    return sorted(
+        (
+            {
+                "name": item["name"],
+                "generation": item.get("generation"),
+                "size": int(item.get("size", 0)),
+            }
+            for item in items
+            if item["name"].endswith(".tif")
+        ),
+        key=lambda entry: entry["name"],
+    )
 
 
 def list_all_gcs_tiles(
@@ -69,8 +242,9 @@ def list_all_gcs_tiles(
 ) -> dict[str, int]:
     """Scan all tiles on GCS and return tile counts grouped by covariate.
 
-    Makes paginated API calls listing every ``.tif`` object under *prefix*,
-    then matches each filename to the longest known covariate name.
+    Lists every ``.tif`` object under *prefix* as several concurrent,
+    paginated key-range listings, then matches each filename to the longest
+    known covariate name.
 
     Parameters
     ----------
@@ -87,45 +261,54 @@ def list_all_gcs_tiles(
         Mapping of covariate name → number of tiles found on GCS.
     """
     norm_prefix = prefix.strip("/") + "/"
-    base_url = (
-        f"https://storage.googleapis.com/storage/v1/b/{bucket}/o"
-        f"?prefix={norm_prefix}&maxResults=1000"
-    )
 
-    all_items: list[dict] = []
-    page_token = None
-    while True:
-        url = base_url
-        if page_token:
-            url += f"&pageToken={page_token}"
-        resp = requests.get(url, timeout=60)
-        resp.raise_for_status()
-        data = resp.json()
-        all_items.extend(data.get("items", []))
-        page_token = data.get("nextPageToken")
-        if not page_token:
-            break
+    # Split the key space at covariate-name boundaries into contiguous,
+    # non-overlapping [start, end) ranges and list them concurrently.  The
+    # first range has no lower bound and the last no upper bound, so the
+    # union is exactly the full prefix listing.
+    names = sorted(set(known_covariates))
+    n_shards = max(1, min(GCS_LIST_SHARDS, len(names)))
+    splits = sorted({
+        norm_prefix + names[len(names) * i // n_shards]
+        for i in range(1, n_shards)
+    })
+    ranges = list(zip([None] + splits, splits + [None]))
+
+    # Build the shared client here, so the shard threads never race to
+    # create it (lru_cache does not lock while the first call runs)
+    _get_gcs_api_client()
+    with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+        shards = list(pool.map(
+            lambda r: _list_gcs_object_names(bucket, norm_prefix, *r), ranges,
+        ))
 
     # Extract filenames (strip the prefix)
     filenames = [
-        item["name"][len(norm_prefix):]
-        for item in all_items
-        if item["name"].endswith(".tif")
+        name[len(norm_prefix):]
+        for shard in shards
+        for name in shard
+        if name.endswith(".tif")
     ]
 
     if not filenames:
         return {}
 
-    # Sort known names longest-first so e.g. "fc_2000" matches before "fc_"
-    sorted_names = sorted(known_covariates, key=len, reverse=True)
+    # A filename belongs to the covariate whose name is its longest prefix
+    # followed by either a digit or ".tif".  Rather than testing every
+    # name, try each distinct name length longest-first (so e.g. "fc_2000"
+    # matches before "fc_") and look the prefix up in a set.
+    name_set = set(known_covariates)
+    lengths = sorted({len(n) for n in name_set}, reverse=True)
 
     counts: dict[str, int] = {}
     for fname in filenames:
-        for cov_name in sorted_names:
-            if fname.startswith(cov_name) and (
-                fname == cov_name + ".tif"
-                or (len(fname) > len(cov_name) and fname[len(cov_name)].isdigit())
-            ):
+        for n in lengths:
+            if len(fname) <= n:
+                continue
+            if not (fname[n].isdigit() or fname[n:] == ".tif"):
+                continue
+            cov_name = fname[:n]
+            if cov_name in name_set:
                 counts[cov_name] = counts.get(cov_name, 0) + 1
                 break
 
@@ -141,25 +324,17 @@ def list_gcs_cog_objects(bucket: str, prefix: str) -> list[dict]:
         * ``size``  – file size in bytes (int)
         * ``covariate`` – inferred covariate name (filename without extension)
     """
-    api_url = (
-        f"https://storage.googleapis.com/storage/v1/b/{bucket}/o"
-        f"?prefix={prefix.strip('/')}/&maxResults=1000"
-    )
-    resp = requests.get(api_url, timeout=30)
-    resp.raise_for_status()
-    items = resp.json().get("items", [])
-
+    api_url = f"https://storage.googleapis.com/storage/v1/b/{bucket}/o"
+    params = {
+        "prefix": f"{prefix.strip('/')}/",
+        "maxResults": 1000,
+        "fields": "items(name,size),nextPageToken",
+    }
     results = []
-    page_token = None
     while True:
-        url = api_url
-        if page_token:
-            url += f"&pageToken={page_token}"
-        resp = requests.get(url, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
+        data = _gcs_api_get(api_url, params)
         items = data.get("items", [])
-        
+
         for item in items:
             obj_name = item["name"]
             if not obj_name.endswith(".tif"):
@@ -173,10 +348,11 @@ def list_gcs_cog_objects(bucket: str, prefix: str) -> list[dict]:
                 "size": int(item.get("size", 0)),
                 "covariate": covariate,
             })
-        
+
         page_token = data.get("nextPageToken")
         if not page_token:
             break
+        params["pageToken"] = page_token
     return results
 
 
@@ -190,7 +366,7 @@ def list_s3_cog_objects(bucket: str, prefix: str,
         * ``size``      – file size in bytes (int)
         * ``covariate`` – inferred covariate name (filename without extension)
     """
-    s3 = boto3.client("s3", region_name=region)
+    s3 = _s3_client(region)
     paginator = s3.get_paginator("list_objects_v2")
     norm_prefix = prefix.strip("/") + "/"
 
@@ -213,22 +389,78 @@ def list_s3_cog_objects(bucket: str, prefix: str,
 
 def delete_s3_cog(bucket: str, prefix: str, covariate_name: str,
                   region: str = "us-east-1") -> bool:
-    """Delete a merged COG from S3.
+    """Delete a merged COG and its tile manifest from S3.
 
-    Returns True if the object was deleted, False if it didn't exist.
+    S3 deletes are idempotent, so both keys go in a single
+    ``delete_objects`` request without first checking that they exist.
+    Returns True once the objects are gone (whether or not they existed).
     """
     key = f"{prefix.strip('/')}/{covariate_name}.tif"
-    s3 = boto3.client("s3", region_name=region)
-    try:
-        s3.head_object(Bucket=bucket, Key=key)
-    except s3.exceptions.ClientError:
-        logger.info("S3 COG not found: s3://%s/%s", bucket, key)
-        return False
-    s3.delete_object(Bucket=bucket, Key=key)
-    logger.info("Deleted S3 COG: s3://%s/%s", bucket, key)
+    s3 = _s3_client(region)
+    resp = s3.delete_objects(
+        Bucket=bucket,
+        Delete={
+            "Objects": [{"Key": key}, {"Key": _manifest_key(key)}],
+            "Quiet": True,
+        },
+    )
+    # Per-key failures come back in the response rather than as an error
+    errors = resp.get("Errors")
+    if errors:
+        raise RuntimeError(f"Failed to delete from s3://{bucket}: {errors}")
+    logger.info("Deleted S3 COG and manifest (if present): s3://%s/%s",
+                bucket, key)
     return True
 
 
+# GCS JSON API batch endpoint; accepts at most 100 sub-requests per call
+GCS_BATCH_URL = "https://storage.googleapis.com/batch/storage/v1"
+GCS_BATCH_SIZE = 100
+
+
+def _gcs_batch_delete(bucket: str, obj_names: list[str],
+                      token: str) -> dict[str, int]:
+    """Delete up to ``GCS_BATCH_SIZE`` objects in one multipart batch call.
+
+    Returns a mapping of object name → HTTP status of its sub-request.
+    Objects whose sub-response could not be parsed are omitted.
+    """
+    boundary = f"batch_{uuid.uuid4().hex}"
+    parts = []
+    for i, name in enumerate(obj_names):
+        encoded_name = urllib.parse.quote(name, safe="")
+        parts.append(
+            f"--{boundary}\r\n"
+            "Content-Type: application/http\r\n"
+            f"Content-ID: <{i}>\r\n\r\n"
+            f"DELETE /storage/v1/b/{bucket}/o/{encoded_name} HTTP/1.1\r\n\r\n"
+        )
+    body = "".join(parts) + f"--{boundary}--\r\n"
+
+    # Headers on the outer request (Authorization) apply to every part
+    resp = _get_http_session().post(
+        GCS_BATCH_URL,
+        data=body.encode("utf-8"),
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Content-Type": f"multipart/mixed; boundary={boundary}",
+        },
+        timeout=60,
+    )
+    resp.raise_for_status()
+
+    resp_boundary = resp.headers.get("Content-Type", "").split(
+        "boundary=", 1
+    )[-1].strip('"')
+    statuses: dict[str, int] = {}
+    for part in resp.text.split(f"--{resp_boundary}"):
+        m_id = re.search(r"Content-ID:\s*<response-(\d+)>", part, re.I)
+        m_status = re.search(r"HTTP/1\.1 (\d{3})", part)
+        if m_id and m_status and int(m_id.group(1)) < len(obj_names):
+            statuses[obj_names[int(m_id.group(1))]] = int(m_status.group(1))
+    return statuses
+
+
 def delete_gcs_tiles(bucket: str, prefix: str,
                      covariate_name: str) -> int:
     """Delete all GCS tiles for a covariate.
@@ -240,9 +472,6 @@ def delete_gcs_tiles(bucket: str, prefix: str,
     Falls back to doing nothing if no credentials are available
     (GCS public buckets don't support unauthenticated deletes).
     """
-    import google.auth
-    import google.auth.transport.requests
-
     # List all tile objects for this covariate
     tile_urls = list_gcs_tiles(bucket, prefix, covariate_name)
     if not tile_urls:
@@ -250,11 +479,7 @@ def delete_gcs_tiles(bucket: str, prefix: str,
 
     # Get authenticated credentials
     try:
-        credentials, _project = google.auth.default(
-            scopes=["https://www.googleapis.com/auth/devstorage.full_control"]
-        )
-        auth_req = google.auth.transport.requests.Request()
-        credentials.refresh(auth_req)
+        credentials = _get_gcs_credentials()
     except Exception:
         logger.warning(
             "No GCS credentials available — cannot delete tiles for %s",
@@ -262,31 +487,32 @@ def delete_gcs_tiles(bucket: str, prefix: str,
         )
         return 0
 
+    # Extract object names from URLs
+    # URL: https://storage.googleapis.com/{bucket}/{object_name}
+    obj_names = [url.split(f"/{bucket}/", 1)[-1] for url in tile_urls]
+
     deleted = 0
-    for url in tile_urls:
-        # Extract object name from URL
-        # URL: https://storage.googleapis.com/{bucket}/{object_name}
-        obj_name = url.split(f"/{bucket}/", 1)[-1]
-        import urllib.parse
-        encoded_name = urllib.parse.quote(obj_name, safe="")
-        delete_url = (
-            f"https://storage.googleapis.com/storage/v1/b/{bucket}"
-            f"/o/{encoded_name}"
-        )
-        resp = requests.delete(
-            delete_url,
-            headers={"Authorization": f"Bearer {credentials.token}"},
-            timeout=30,
-        )
-        if resp.status_code in (200, 204):
-            deleted += 1
-        elif resp.status_code == 404:
-            logger.debug("GCS tile already gone: %s", obj_name)
-        else:
+    for start in range(0, len(obj_names), GCS_BATCH_SIZE):
+        batch = obj_names[start:start + GCS_BATCH_SIZE]
+        try:
+            statuses = _gcs_batch_delete(bucket, batch, credentials.token)
+        except Exception as exc:
             logger.warning(
-                "Failed to delete GCS tile %s: %s %s",
-                obj_name, resp.status_code, resp.text[:200],
+                "Batch delete of %d GCS tiles for %s failed: %s",
+                len(batch), covariate_name, exc,
             )
+            continue
+        for obj_name in batch:
+            status = statuses.get(obj_name)
+            if status in (200, 204):
+                deleted += 1
+            elif status == 404:
+                logger.debug("GCS tile already gone: %s", obj_name)
+            else:
+                logger.warning(
+                    "Failed to delete GCS tile %s: status %s",
+                    obj_name, status,
+                )
     logger.info("Deleted %d/%d GCS tiles for %s", deleted, len(tile_urls),
                 covariate_name)
     return deleted
@@ -295,21 +521,56 @@ def delete_gcs_tiles(bucket: str, prefix: str,
 def _download_tile(url: str, dest_dir: str) -> str:
     """Download a single tile to *dest_dir*, returning the local path."""
     filename = url.rsplit("/", 1)[-1]
-    local_path = os.path.join(dest_dir, filename)
-    logger.info("Downloading tile: %s", url)
-    with requests.get(url, stream=True, timeout=300) as resp:
+    return _download_to(url, os.path.join(dest_dir, filename))
+
+
+def _download_to(url: str, local_path: str) -> str:
+    """Stream *url* to *local_path*, returning the local path."""
+    logger.debug("Downloading tile: %s", url)
+    with _get_http_session().get(url, stream=True, timeout=300) as resp:
         resp.raise_for_status()
+        # Pipe the socket straight into the file in small blocks rather
+        # than assembling large chunks in Python first
+        resp.raw.decode_content = True
         with open(local_path, "wb") as fh:
-            for chunk in resp.iter_content(chunk_size=8 * 1024 * 1024):
-                fh.write(chunk)
-    size_mb = os.path.getsize(local_path) / (1024 * 1024)
-    logger.info("  -> %s (%.1f MB)", filename, size_mb)
+            shutil.copyfileobj(resp.raw, fh, length=DOWNLOAD_BUFFER_SIZE)
+    if logger.isEnabledFor(logging.DEBUG):
+        size_mb = os.path.getsize(local_path) / (1024 * 1024)
+        logger.debug("  -> %s (%.1f MB)", os.path.basename(local_path),
+                     size_mb)
     return local_path
 
 
+def _manifest_key(cog_key: str) -> str:
+    """Return the S3 key of the tile manifest stored beside *cog_key*."""
+    return cog_key.removesuffix(".tif") + ".manifest.json"
+
+
+def _load_s3_manifest(s3, bucket: str, cog_key: str) -> list[dict] | None:
+    """Return the tile manifest recorded for *cog_key*, or None.
+
+    The manifest only lets an unchanged re-merge be skipped, so any
+    failure to read it (including the 403 S3 returns for a missing key
+    without ``s3:ListBucket``) is logged and treated as no manifest.
+    """
+    key = _manifest_key(cog_key)
+    try:
+        obj = s3.get_object(Bucket=bucket, Key=key)
+        return json.loads(obj["Body"].read())
+    except ClientError as exc:
+        code = exc.response.get("Error", {}).get("Code")
+        if code not in ("NoSuchKey", "404"):
+            logger.warning("Could not read manifest s3://%s/%s (%s); "
+                           "merging anyway", bucket, key, code)
+    except Exception:
+        logger.warning("Could not read manifest s3://%s/%s; merging anyway",
+                       bucket, key, exc_info=True)
+    return None
+
+
 def _upload_to_s3(local_path: str, bucket: str, key: str,
                   region: str = "us-east-1") -> str:
-    """Upload a file to S3.
+    """Upload a file to S3 as a parallel multipart upload.
 
     Uses the default boto3 credential chain (env vars, instance profile,
     etc.).
@@ -323,10 +584,11 @@ def _upload_to_s3(local_path: str, bucket: str, key: str,
     logger.info("Uploading %s (%.1f MB) -> s3://%s/%s",
                 local_path, file_size / (1024 * 1024), bucket, key)
 
-    s3 = boto3.client("s3", region_name=region)
+    s3 = _s3_client(region)
     s3.upload_file(
         local_path, bucket, key,
         ExtraArgs={"ContentType": "image/tiff"},
+        Config=S3_UPLOAD_CONFIG,
     )
     url = f"https://{bucket}.s3.amazonaws.com/{key}"
     logger.info("Upload complete: %s", url)
@@ -337,31 +599,156 @@ def _upload_to_s3(local_path: str, bucket: str, key: str,
 # GDAL merge pipeline
 # ---------------------------------------------------------------------------
 
+# GDAL options applied when tiles are read straight from GCS over HTTP
+VSICURL_CONFIG = {
+    "GDAL_HTTP_MULTIPLEX": "YES",
+    "GDAL_HTTP_VERSION": "2",
+    "GDAL_HTTP_MAX_RETRY": "3",
+    "GDAL_HTTP_RETRY_DELAY": "1",
+    "GDAL_DISABLE_READDIR_ON_OPEN": "EMPTY_DIR",
+    "CPL_VSIL_CURL_ALLOWED_EXTENSIONS": ".tif",
+    "VSI_CACHE": "TRUE",
+    "VSI_CACHE_SIZE": str(512 * 1024 * 1024),
+}
+
+
+def _import_gdal():
+    """Return the ``osgeo.gdal`` module, or None if it is not installed."""
+    try:
+        from osgeo import gdal
+    except ImportError:
+        return None
+    gdal.UseExceptions()
+    return gdal
+
+
+def _vsicurl_paths(gdal, tile_urls: list[str]) -> list[str]:
+    """Configure GDAL's HTTP driver and return ``/vsicurl/`` tile paths.
+
+    GDAL then fetches only the byte ranges it needs from each tile while
+    building the mosaic, so tiles never have to be staged on local disk.
+    """
+    for key, value in VSICURL_CONFIG.items():
+        gdal.SetConfigOption(key, value)
+    return [f"/vsicurl/{url}" for url in tile_urls]
+
+
 def _run_cmd(cmd: list[str]) -> None:
-    """Run a shell command, raising on failure."""
-    logger.info("Running: %s", " ".join(cmd))
-    result = subprocess.run(cmd, capture_output=True, text=True, check=False)
-    if result.returncode != 0:
-        logger.error("STDOUT: %s", result.stdout)
-        logger.error("STDERR: %s", result.stderr)
+    """Run a shell command, raising on failure.
+
+    stderr is streamed into the log line by line and only its last lines
+    are kept for the error message, so memory use does not grow with the
+    amount of output GDAL produces.  stdout is discarded.
+    """
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Running: %s", " ".join(cmd))
+    tail = collections.deque(maxlen=64)
+    with subprocess.Popen(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        text=True, bufsize=1,
+    ) as proc:
+        for line in proc.stderr:
+            tail.append(line)
+            logger.debug("%s", line.rstrip())
+        returncode = proc.wait()
+    if returncode != 0:
+        stderr = "".join(tail)
+        logger.error("STDERR (last %d lines): %s", len(tail), stderr)
         raise RuntimeError(
-            f"Command failed (exit {result.returncode}): {' '.join(cmd)}\n"
-            f"{result.stderr}"
+            f"Command failed (exit {returncode}): {' '.join(cmd)}\n{stderr}"
+        )
+
+
+# COG creation options shared by the in-process and CLI merge paths
+COG_CREATION_OPTIONS = [
+    "COMPRESS=DEFLATE",
+    "PREDICTOR=2",          # horizontal differencing (good for int)
+    "NUM_THREADS=ALL_CPUS",
+    "BIGTIFF=IF_SAFER",
+]
+
+
+def _is_deflate_cog(gdal, path: str) -> bool:
+    """Return True if *path* is already a DEFLATE-compressed COG."""
+    info = gdal.Info(path, format="json")
+    structure = info.get("metadata", {}).get("IMAGE_STRUCTURE", {})
+    return (structure.get("LAYOUT") == "COG"
+            and structure.get("COMPRESSION") == "DEFLATE")
+
+
+def _copy_tile(path: str, output_path: str) -> None:
+    """Copy a single local or ``/vsicurl/`` tile to *output_path* as-is."""
+    if path.startswith("/vsicurl/"):
+        _download_to(path.removeprefix("/vsicurl/"), output_path)
+    else:
+        shutil.copyfile(path, output_path)
+
+
+def _merge_in_process(gdal, tile_paths: list[str], output_path: str) -> None:
+    """Mosaic *tile_paths* into a COG with the GDAL Python bindings.
+
+    The VRT only exists in memory and is handed straight to the COG
+    driver, so no helper processes are spawned and no .vrt is written.
+    A single tile is translated directly, without a VRT.
+    """
+    if len(tile_paths) == 1:
+        vrt_ds = tile_paths[0]
+    else:
+        vrt_ds = gdal.BuildVRT("", tile_paths)
+    try:
+        out_ds = gdal.Translate(
+            output_path, vrt_ds,
+            format="COG", creationOptions=COG_CREATION_OPTIONS,
         )
+        # Dereferencing the dataset flushes and closes the output file
+        out_ds = None
+    finally:
+        vrt_ds = None
+
+
+def _merge_with_cli(tile_paths: list[str], output_path: str) -> None:
+    """Mosaic *tile_paths* into a COG with ``gdalbuildvrt`` + ``gdal_translate``.
+
+    A single tile is passed straight to ``gdal_translate``.
+    """
+    if len(tile_paths) == 1:
+        vrt_path = None
+        source = tile_paths[0]
+    else:
+        # Step 1: Build VRT mosaic
+        vrt_path = output_path + ".vrt"
+        _run_cmd(["gdalbuildvrt", vrt_path] + tile_paths)
+        source = vrt_path
+
+    # Step 2: Translate VRT -> COG with lossless DEFLATE compression
+    cmd = ["gdal_translate", "-of", "COG"]
+    for opt in COG_CREATION_OPTIONS:
+        cmd += ["-co", opt]
+    _run_cmd(cmd + [source, output_path])
+
+    # Clean up the intermediate VRT
+    if vrt_path and os.path.exists(vrt_path):
+        os.remove(vrt_path)
 
 
 def merge_tiles_to_cog(tile_paths: list[str], output_path: str) -> str:
     """Merge multiple GeoTIFF tiles into a single COG with DEFLATE compression.
 
     Pipeline:
-        1. ``gdalbuildvrt`` — create a virtual mosaic of all input tiles
-        2. ``gdal_translate`` — materialise the mosaic as a single
-           Cloud-Optimized GeoTIFF with DEFLATE (lossless) compression
+        1. Build a virtual (VRT) mosaic of all input tiles
+        2. Materialise the mosaic as a single Cloud-Optimized GeoTIFF with
+           DEFLATE (lossless) compression
+
+    Both steps run in-process through the GDAL Python bindings when they
+    are installed, falling back to the ``gdalbuildvrt`` and
+    ``gdal_translate`` command-line tools otherwise.  A single tile skips
+    the VRT, and one that is already a DEFLATE COG is copied unchanged.
 
     Parameters
     ----------
     tile_paths : list[str]
-        Local file paths to the input GeoTIFF tiles.
+        Paths to the input GeoTIFF tiles.  These may be local files or,
+        when the GDAL bindings are used, ``/vsicurl/`` URLs.
     output_path : str
         Desired output file path for the merged COG.
 
@@ -373,26 +760,17 @@ def merge_tiles_to_cog(tile_paths: list[str], output_path: str) -> str:
     if not tile_paths:
         raise ValueError("No tiles provided for merging")
 
-    vrt_path = output_path + ".vrt"
-
-    # Step 1: Build VRT mosaic
-    _run_cmd(["gdalbuildvrt", vrt_path] + tile_paths)
-
-    # Step 2: Translate VRT -> COG with lossless DEFLATE compression
-    _run_cmd([
-        "gdal_translate",
-        "-of", "COG",
-        "-co", "COMPRESS=DEFLATE",
-        "-co", "PREDICTOR=2",         # horizontal differencing (good for int)
-        "-co", "NUM_THREADS=ALL_CPUS",
-        "-co", "BIGTIFF=IF_SAFER",
-        vrt_path,
-        output_path,
-    ])
-
-    # Clean up the intermediate VRT
-    if os.path.exists(vrt_path):
-        os.remove(vrt_path)
+    gdal = _import_gdal()
+    if (gdal is not None and len(tile_paths) == 1
+            and _is_deflate_cog(gdal, tile_paths[0])):
+        logger.info("Single tile is already a DEFLATE COG, copying as-is")
+        _copy_tile(tile_paths[0], output_path)
+    elif gdal is not None:
+        logger.info("Merging %d tile(s) in-process with GDAL %s",
+                    len(tile_paths), gdal.__version__)
+        _merge_in_process(gdal, tile_paths, output_path)
+    else:
+        _merge_with_cli(tile_paths, output_path)
 
     size_mb = os.path.getsize(output_path) / (1024 * 1024)
     logger.info("Merged COG created: %s (%.1f MB)", output_path, size_mb)
@@ -411,7 +789,7 @@ def merge_covariate_tiles(
     output_prefix: str = "avoided-emissions/cog",
     aws_region: str = "us-east-1",
 ) -> dict:
-    """Download tiles from GCS, merge into COG, upload to S3.
+    """Read tiles from GCS, merge into COG, upload to S3.
 
     Parameters
     ----------
@@ -431,7 +809,9 @@ def merge_covariate_tiles(
     Returns
     -------
     dict
-        ``{"url": str, "size_bytes": int, "n_tiles": int}``
+        ``{"url": str, "size_bytes": int, "n_tiles": int}``, plus
+        ``"skipped": True`` when the existing COG was built from the same
+        tiles and the merge was not re-run.
 
     Raises
     ------
@@ -439,7 +819,13 @@ def merge_covariate_tiles(
         If no tiles are found, or GDAL commands fail.
     """
     # 1. List tiles on GCS (source)
-    tile_urls = list_gcs_tiles(source_bucket, source_prefix, covariate_name)
+    manifest = list_gcs_tile_manifest(
+        source_bucket, source_prefix, covariate_name,
+    )
+    tile_urls = [
+        f"https://storage.googleapis.com/{source_bucket}/{entry['name']}"
+        for entry in manifest
+    ]
     if not tile_urls:
         raise RuntimeError(
             f"No tiles found for covariate '{covariate_name}' in "
@@ -451,25 +837,67 @@ def merge_covariate_tiles(
         n_tiles, covariate_name, source_bucket, source_prefix,
     )
 
-    # If there's only 1 tile, it's already a COG — just re-upload with
-    # DEFLATE compression applied.
+    # Skip the whole pipeline if the COG on S3 was built from exactly these
+    # tiles (same names and GCS generations)
+    output_filename = f"{covariate_name}.tif"
+    s3_key = f"{output_prefix}/{output_filename}".strip("/")
+    s3 = _s3_client(aws_region)
+    if _load_s3_manifest(s3, output_bucket, s3_key) == manifest:
+        try:
+            head = s3.head_object(Bucket=output_bucket, Key=s3_key)
+        except ClientError:
+            head = None
+        if head is not None:
+            logger.info("Tiles for '%s' unchanged since last merge, skipping",
+                        covariate_name)
+            return {
+                "url": f"https://{output_bucket}.s3.amazonaws.com/{s3_key}",
+                "size_bytes": head["ContentLength"],
+                "n_tiles": n_tiles,
+                "skipped": True,
+            }
+
+    # If there's only 1 tile, merge_tiles_to_cog skips the mosaic step and
+    # re-uploads it as-is when it is already a DEFLATE COG.
     workdir = tempfile.mkdtemp(prefix=f"cog_{covariate_name}_")
     try:
-        # 2. Download all tiles
-        local_tiles = [_download_tile(url, workdir) for url in tile_urls]
+        # 2. With the GDAL bindings, read tiles straight from GCS via
+        #    /vsicurl/ range requests.  Otherwise download all tiles
+        #    concurrently (I/O bound); map() keeps the tile order stable
+        #    for the VRT mosaic
+        gdal = _import_gdal()
+        if gdal is not None:
+            tile_paths = _vsicurl_paths(gdal, tile_urls)
+        else:
+            workers = min(MAX_DOWNLOAD_WORKERS, n_tiles)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                tile_paths = list(
+                    pool.map(lambda url: _download_tile(url, workdir),
+                             tile_urls)
+                )
 
         # 3. Merge into a single COG
-        output_filename = f"{covariate_name}.tif"
         output_path = os.path.join(workdir, output_filename)
-        merge_tiles_to_cog(local_tiles, output_path)
+        merge_tiles_to_cog(tile_paths, output_path)
 
         merged_size = os.path.getsize(output_path)
 
-        # 4. Upload merged COG to S3
-        s3_key = f"{output_prefix}/{output_filename}".strip("/")
+        # 4. Upload merged COG to S3, then record the tiles it was built
+        #    from so an unchanged re-merge can be skipped
         s3_url = _upload_to_s3(
             output_path, output_bucket, s3_key, aws_region
         )
+        try:
+            s3.put_object(
+                Bucket=output_bucket, Key=_manifest_key(s3_key),
+                Body=json.dumps(manifest).encode(),
+                ContentType="application/json",
+            )
+        except Exception:
+            # The COG is already uploaded; without a manifest the next
+            # merge just cannot be skipped
+            logger.warning("Could not write manifest for s3://%s/%s",
+                           output_bucket, s3_key, exc_info=True)
 
         return {
             "url": s3_url,
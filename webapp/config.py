@@ -39,6 +39,10 @@ class Config:
     GIT_REVISION = os.environ.get("GIT_REVISION", "")
     CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://redis:6379/0")
     CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", "redis://redis:6379/0")
+    # Short-lived app cache (parsed uploads).  Deployments point this at
+    # the memory-capped upload-cache Redis; it only falls back to the
+    # broker's Redis for local runs.
+    REDIS_URL = os.environ.get("REDIS_URL", CELERY_BROKER_URL)
 
     # trends.earth API integration
     TRENDSEARTH_API_URL = os.environ.get(
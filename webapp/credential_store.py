@@ -8,9 +8,12 @@ at rest in the database.
 import base64
 import hashlib
 import logging
+from contextlib import contextmanager
 from datetime import datetime, timezone
+from functools import lru_cache
 
 from cryptography.fernet import Fernet
+from sqlalchemy.orm import Session
 
 from config import Config
 from models import TrendsEarthCredential, get_db
@@ -18,8 +21,9 @@ from models import TrendsEarthCredential, get_db
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
 def _fernet() -> Fernet:
-    """Derive a Fernet key from ``Config.SECRET_KEY``."""
+    """Derive a Fernet key from ``Config.SECRET_KEY`` (computed once)."""
     # Fernet requires a 32-byte url-safe base64-encoded key.
     # Derive one deterministically from the app secret.
     key_bytes = hashlib.sha256(Config.SECRET_KEY.encode()).digest()
@@ -38,20 +42,35 @@ def decrypt_secret(encrypted: str) -> str:
 
 # ------------------------------------------------------------------
 # CRUD helpers
+#
+# Each helper accepts an optional *db* session so that a caller doing
+# several credential operations can share one session (and one pooled
+# connection).  A session passed in is left open for the caller.
 # ------------------------------------------------------------------
 
 
-def get_credential(user_id) -> TrendsEarthCredential | None:
-    """Return the stored credential for *user_id*, or ``None``."""
+@contextmanager
+def _session(db: Session | None):
+    """Yield *db*, or a new session that is closed on exit."""
+    if db is not None:
+        yield db
+        return
     db = get_db()
     try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_credential(user_id, db: Session | None = None
+                   ) -> TrendsEarthCredential | None:
+    """Return the stored credential for *user_id*, or ``None``."""
+    with _session(db) as db:
         return (
             db.query(TrendsEarthCredential)
             .filter(TrendsEarthCredential.user_id == user_id)
             .first()
         )
-    finally:
-        db.close()
 
 
 def save_credential(
@@ -61,76 +80,70 @@ def save_credential(
     client_secret: str,
     client_name: str = "avoided-emissions-web",
     api_client_db_id: str | None = None,
+    db: Session | None = None,
 ) -> TrendsEarthCredential:
     """Store (or replace) the user's trends.earth OAuth2 credential.
 
     The *client_secret* is encrypted before being written to the database.
     """
     encrypted = encrypt_secret(client_secret)
-    db = get_db()
-    try:
-        existing = (
-            db.query(TrendsEarthCredential)
-            .filter(TrendsEarthCredential.user_id == user_id)
-            .first()
-        )
-        if existing:
-            existing.te_email = te_email
-            existing.client_id = client_id
-            existing.client_secret_encrypted = encrypted
-            existing.client_name = client_name
-            existing.api_client_db_id = api_client_db_id
-            existing.updated_at = datetime.now(timezone.utc)
+    with _session(db) as db:
+        try:
+            existing = (
+                db.query(TrendsEarthCredential)
+                .filter(TrendsEarthCredential.user_id == user_id)
+                .first()
+            )
+            if existing:
+                existing.te_email = te_email
+                existing.client_id = client_id
+                existing.client_secret_encrypted = encrypted
+                existing.client_name = client_name
+                existing.api_client_db_id = api_client_db_id
+                existing.updated_at = datetime.now(timezone.utc)
+                db.commit()
+                db.refresh(existing)
+                return existing
+
+            cred = TrendsEarthCredential(
+                user_id=user_id,
+                te_email=te_email,
+                client_id=client_id,
+                client_secret_encrypted=encrypted,
+                client_name=client_name,
+                api_client_db_id=api_client_db_id,
+            )
+            db.add(cred)
             db.commit()
-            db.refresh(existing)
-            return existing
-
-        cred = TrendsEarthCredential(
-            user_id=user_id,
-            te_email=te_email,
-            client_id=client_id,
-            client_secret_encrypted=encrypted,
-            client_name=client_name,
-            api_client_db_id=api_client_db_id,
-        )
-        db.add(cred)
-        db.commit()
-        db.refresh(cred)
-        return cred
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+            db.refresh(cred)
+            return cred
+        except Exception:
+            db.rollback()
+            raise
 
 
-def delete_credential(user_id) -> bool:
+def delete_credential(user_id, db: Session | None = None) -> bool:
     """Delete the stored credential for *user_id*.  Returns True if deleted."""
-    db = get_db()
-    try:
-        cred = (
-            db.query(TrendsEarthCredential)
-            .filter(TrendsEarthCredential.user_id == user_id)
-            .first()
-        )
-        if cred is None:
-            return False
-        db.delete(cred)
-        db.commit()
-        return True
-    except Exception:
-        db.rollback()
-        raise
-    finally:
-        db.close()
+    with _session(db) as db:
+        try:
+            cred = get_credential(user_id, db=db)
+            if cred is None:
+                return False
+            db.delete(cred)
+            db.commit()
+            return True
+        except Exception:
+            db.rollback()
+            raise
 
 
-def get_decrypted_secret(user_id) -> tuple[str, str] | None:
+def get_decrypted_secret(user_id, db: Session | None = None
+                         ) -> tuple[str, str] | None:
     """Return ``(client_id, client_secret)`` for *user_id*, or ``None``.
 
     The client_secret is decrypted from the database.
     """
-    cred = get_credential(user_id)
+    cred = get_credential(user_id, db=db)
     if cred is None:
         return None
     try:
@@ -1,24 +1,42 @@
 """Import vector reference data into PostGIS tables.
 
 Downloads geoBoundaries (CGAZ ADM0/1/2), RESOLVE ecoregions, and WDPA
-protected areas data and loads them into the database.  Each table is
-only populated when it is empty, making repeated runs idempotent.
+protected areas data (concurrently) and loads them into the database.
+Each table is only populated when it is empty, making repeated runs
+idempotent.
+
+Downloads are kept in a local cache (``VECTOR_DATA_CACHE_DIR``, by default
+``~/.cache/avoided-emissions``) and reused while they match the remote file.
 
 Usage:
-    python import_vector_data.py          # import all datasets
-    python import_vector_data.py --check  # only report which tables need data
+    python import_vector_data.py             # import all datasets
+    python import_vector_data.py --check     # report tables needing data
+    python import_vector_data.py --no-cache  # re-download all source files
 """
 
+import hashlib
+import io
 import logging
 import os
+import re
 import shutil
+import struct
 import sys
 import tempfile
 import zipfile
-from pathlib import Path
-from urllib.request import urlretrieve
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path, PurePosixPath
 
+import fiona
 import geopandas as gpd
+import numpy as np
+import pandas as pd
+import requests
+import shapely
+from pyproj import Transformer
 from sqlalchemy import create_engine, text
 
 from config import Config
@@ -53,6 +71,36 @@ DOWNLOAD_URLS = {
     ),
 }
 
+# Local filename each download is saved under in the temp directory
+DOWNLOAD_FILENAMES = {
+    "geoboundaries_adm0": "geoBoundariesCGAZ_ADM0.gpkg",
+    "geoboundaries_adm1": "geoBoundariesCGAZ_ADM1.gpkg",
+    "geoboundaries_adm2": "geoBoundariesCGAZ_ADM2.gpkg",
+    "ecoregions": "resolve_ecoregions.gpkg",
+    "wdpa": "wdpa.zip",
+}
+
+# Persistent download cache, so a failed ingest can be retried without
+# fetching gigabytes again
+CACHE_DIR = Path(os.environ.get(
+    "VECTOR_DATA_CACHE_DIR", Path.home() / ".cache" / "avoided-emissions",
+))
+
+# Number of datasets downloaded concurrently
+MAX_DOWNLOAD_WORKERS = 4
+
+# Number of tables loaded concurrently, each over its own connection.
+# The tables have no foreign keys between them, so loads are independent
+MAX_INGEST_WORKERS = 3
+
+# Files at least this large are downloaded as this many concurrent
+# byte-range requests when the server supports them
+RANGE_DOWNLOAD_MIN_SIZE = 64 * 1024 * 1024
+RANGE_DOWNLOAD_PARTS = 8
+
+# Features read, transformed and copied to PostGIS per batch
+READ_BATCH_SIZE = 50000
+
 # ---------------------------------------------------------------------------
 # Column mappings (source column name -> DB column name)
 # ---------------------------------------------------------------------------
@@ -115,61 +163,268 @@ WDPA_COL_MAP = {
 # ---------------------------------------------------------------------------
 
 
-def _table_is_empty(engine, table_name: str) -> bool:
-    """Return True if the table exists and has zero rows."""
-    with engine.connect() as conn:
-        result = conn.execute(
-            text(f"SELECT EXISTS (SELECT 1 FROM {table_name} LIMIT 1)")
-        )
-        return not result.scalar()
+def _tables_with_data(conn, table_names: list[str]) -> set[str]:
+    """Return the subset of (existing) *table_names* that have any rows.
 
+    All tables are probed in a single ``UNION ALL`` query.
+    """
+    if not table_names:
+        return set()
+    sql = " UNION ALL ".join(
+        f"SELECT '{name}' AS t WHERE EXISTS (SELECT 1 FROM {name})"
+        for name in table_names
+    )
+    return set(conn.execute(text(sql)).scalars())
+
+
+def _existing_tables(conn, table_names: list[str]) -> set[str]:
+    """Return the subset of *table_names* that exist, in one query."""
+    result = conn.execute(
+        text(
+            "SELECT t FROM unnest(CAST(:tables AS text[])) AS t"
+            " WHERE to_regclass(t) IS NOT NULL"
+        ),
+        {"tables": table_names},
+    )
+    return set(result.scalars())
+
+
+class _RangeNotSupported(Exception):
+    """The server ignored a ``Range`` header and sent the whole body."""
+
+
+def _download_range(url: str, fd: int, start: int, end: int) -> None:
+    """Fetch bytes ``start``-``end`` (inclusive) of *url* into *fd*."""
+    headers = {"Range": f"bytes={start}-{end}"}
+    with requests.get(url, headers=headers, stream=True, timeout=600) as resp:
+        resp.raise_for_status()
+        if resp.status_code != 206:
+            raise _RangeNotSupported(url)
+        offset = start
+        while chunk := resp.raw.read(1024 * 1024):
+            offset += os.pwrite(fd, chunk, offset)
+
+
+def _download_parallel(url: str, dest: Path, size: int) -> None:
+    """Download *url* as concurrent byte ranges into a preallocated file."""
+    part = -(-size // RANGE_DOWNLOAD_PARTS)
+    ranges = [
+        (start, min(start + part, size) - 1)
+        for start in range(0, size, part)
+    ]
+    fd = os.open(dest, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(fd, 0, size)
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            list(pool.map(lambda r: _download_range(url, fd, *r), ranges))
+    finally:
+        os.close(fd)
 
-def _table_exists(engine, table_name: str) -> bool:
-    """Return True if the table exists in the database."""
-    with engine.connect() as conn:
-        result = conn.execute(
-            text(
-                "SELECT EXISTS ("
-                "  SELECT 1 FROM information_schema.tables"
-                "  WHERE table_name = :tbl"
-                ")"
-            ),
-            {"tbl": table_name},
-        )
-        return result.scalar()
 
+def _head(url: str) -> requests.Response:
+    """HEAD *url*, following redirects."""
+    return requests.head(url, allow_redirects=True, timeout=60)
 
-def _download(url: str, dest: Path) -> Path:
-    """Download a file with progress logging.  Returns the local path."""
+
+def _content_length(head: requests.Response) -> int:
+    """Return the size advertised by a HEAD response (0 if unknown)."""
+    return int(head.headers.get("Content-Length", 0)) if head.ok else 0
+
+
+def _download(url: str, dest: Path,
+              head: requests.Response | None = None) -> Path:
+    """Download a file with progress logging.  Returns the local path.
+
+    Large files from servers that accept byte ranges are fetched as
+    several concurrent ranges; anything else is streamed in one request.
+    """
     log.info("Downloading %s → %s", url, dest)
-    urlretrieve(url, dest)
+    if head is None:
+        head = _head(url)
+    size = _content_length(head)
+    ranged = (head.headers.get("Accept-Ranges") == "bytes"
+              and size >= RANGE_DOWNLOAD_MIN_SIZE)
+    if ranged:
+        try:
+            _download_parallel(head.url, dest, size)
+        except _RangeNotSupported:
+            log.info("Server ignored Range requests; downloading in one "
+                     "stream")
+            ranged = False
+    if not ranged:
+        with requests.get(url, stream=True, timeout=600) as resp:
+            resp.raise_for_status()
+            resp.raw.decode_content = True
+            with open(dest, "wb") as fh:
+                shutil.copyfileobj(resp.raw, fh, length=1024 * 1024)
     size_mb = dest.stat().st_size / (1024 * 1024)
     log.info("Downloaded %.1f MB", size_mb)
     return dest
 
 
-def _load_geopackage(path: Path, layer: str | None = None) -> gpd.GeoDataFrame:
-    """Read a GeoPackage (or shapefile) into a GeoDataFrame."""
-    log.info("Reading %s (layer=%s)", path, layer)
-    gdf = gpd.read_file(path, layer=layer)
-    log.info("Loaded %d features", len(gdf))
-    return gdf
+def _get(url: str, filename: str, use_cache: bool = True) -> Path:
+    """Return a local copy of *url*, downloading it only when needed.
+
+    Files are kept in :data:`CACHE_DIR` under a hash of the URL.  A cached
+    file is reused when its size (and ETag, if the server sends one)
+    still matches a HEAD of the URL.  New downloads are written to a
+    ``.part`` file and renamed into place, so an interrupted download is
+    never mistaken for a complete one.
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    key = hashlib.sha256(url.encode()).hexdigest()[:16]
+    path = CACHE_DIR / f"{key}-{filename}"
+    etag_path = path.with_name(path.name + ".etag")
+
+    head = _head(url)
+    etag = head.headers.get("ETag") if head.ok else None
+    if (use_cache and path.exists()
+            and path.stat().st_size == _content_length(head)
+            and (etag is None
+                 or (etag_path.exists() and etag_path.read_text() == etag))):
+        log.info("Using cached download %s", path)
+        return path
+
+    part = path.with_name(path.name + ".part")
+    _download(url, part, head)
+    os.replace(part, path)
+    if etag:
+        etag_path.write_text(etag)
+    else:
+        etag_path.unlink(missing_ok=True)
+    return path
+
+
+def _iter_features(
+    path: Path,
+    layer: str | None = None,
+    columns: Iterable[str] | None = None,
+    batch_size: int = READ_BATCH_SIZE,
+) -> Iterator[gpd.GeoDataFrame]:
+    """Yield a vector layer as GeoDataFrames of at most *batch_size* rows.
+
+    The layer is read in one forward-only pass, holding only one batch in
+    memory at a time.  With pyogrio and pyarrow installed, batches come
+    from an Arrow stream with vectorised geometry decoding; otherwise
+    features are streamed through fiona.  When *columns* is given, only
+    those of them present in the layer are kept.
+    """
+    log.info("Reading %s (layer=%s) in batches of %d", path, layer, batch_size)
+    try:
+        from pyogrio.raw import open_arrow
+    except ImportError:
+        open_arrow = None
+    if columns is not None:
+        columns = list(columns)
+
+    n_read = 0
+    if open_arrow is not None:
+        # Requested names missing from the layer are ignored by pyogrio
+        with open_arrow(
+            path, layer=layer, columns=columns, batch_size=batch_size,
+            use_pyarrow=True,
+        ) as (meta, reader):
+            geometry_name = meta["geometry_name"] or "wkb_geometry"
+            for record_batch in reader:
+                gdf = gpd.GeoDataFrame.from_arrow(
+                    record_batch, geometry=geometry_name,
+                )
+                if gdf.crs is None:
+                    gdf = gdf.set_crs(meta["crs"])
+                n_read += len(gdf)
+                yield gdf
+    else:
+        with fiona.open(path, layer=layer) as src:
+            crs = src.crs
+            keep = None
+            if columns is not None:
+                keep = [
+                    c for c in src.schema["properties"] if c in columns
+                ] + ["geometry"]
+            batch = []
+            for feature in src:
+                batch.append(feature)
+                if len(batch) == batch_size:
+                    n_read += len(batch)
+                    gdf = gpd.GeoDataFrame.from_features(batch, crs=crs)
+                    yield gdf if keep is None else gdf[keep]
+                    batch = []
+            if batch:
+                n_read += len(batch)
+                gdf = gpd.GeoDataFrame.from_features(batch, crs=crs)
+                yield gdf if keep is None else gdf[keep]
+    log.info("Loaded %d features", n_read)
+
+
+# Matches WDPA polygon-layer file names (vs. the points layer)
+_POLYGON_NAME = re.compile(r"polygons", re.IGNORECASE)
+
+
+def _find_polygon_layer(path: Path) -> str | None:
+    """Return the first layer in *path* named like a polygon layer."""
+    try:
+        layers = fiona.listlayers(path)
+    except Exception:
+        return None
+    log.info("Available layers: %s", layers)
+    for lyr in layers:
+        if "poly" in lyr.lower():
+            return lyr
+    return None
 
 
 def _ensure_multipolygon(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-    """Promote any Polygon geometries to MultiPolygon for consistency."""
-    from shapely.geometry import MultiPolygon
+    """Promote any Polygon geometries to MultiPolygon for consistency.
 
-    def _to_multi(geom):
-        if geom is None:
-            return None
-        if geom.geom_type == "Polygon":
-            return MultiPolygon([geom])
-        return geom
+    Uses shapely's vectorised functions, so the promotion runs in a
+    single GEOS pass rather than one Python call per feature.
+    """
+    geoms = gdf["geometry"].to_numpy()
+    is_polygon = shapely.get_type_id(geoms) == shapely.GeometryType.POLYGON
+    n_polygons = int(is_polygon.sum())
+    if not n_polygons:
+        return gdf
+
+    geoms = geoms.copy()
+    # One MultiPolygon per Polygon: part i goes to output geometry i
+    geoms[is_polygon] = shapely.multipolygons(
+        geoms[is_polygon], indices=np.arange(n_polygons),
+    )
+    # Callers pass frames they own (fresh from _select_and_rename), so the
+    # geometry column is replaced in place rather than copying the frame
+    gdf["geometry"] = geoms
+    return gdf
+
+
+@lru_cache(maxsize=8)
+def _transformer_to_wgs84(crs_wkt: str):
+    """Return a cached pyproj transformer from *crs_wkt* to EPSG:4326."""
+    return Transformer.from_crs(crs_wkt, "EPSG:4326", always_xy=True)
+
+
+def _to_wgs84(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Return *gdf* in EPSG:4326, reprojecting only if it is in another CRS.
+
+    A frame without a CRS is assumed to already be in EPSG:4326.
+    Reprojection transforms all vertices of the batch as one coordinate
+    array instead of geometry by geometry, with the transformer built
+    once per source CRS.
+    """
+    if gdf.crs is None or gdf.crs.to_epsg() == 4326:
+        return gdf.set_crs(epsg=4326, allow_override=True)
+
+    transformer = _transformer_to_wgs84(gdf.crs.to_wkt())
+
+    def _transform(coords):
+        x, y = transformer.transform(coords[:, 0], coords[:, 1])
+        return np.column_stack([x, y])
 
     gdf = gdf.copy()
-    gdf["geometry"] = gdf["geometry"].apply(_to_multi)
-    return gdf
+    gdf[gdf.geometry.name] = shapely.transform(
+        gdf.geometry.to_numpy(), _transform,
+    )
+    return gdf.set_crs(epsg=4326, allow_override=True)
 
 
 def _select_and_rename(
@@ -181,41 +436,193 @@ def _select_and_rename(
     if missing:
         log.warning("Source is missing columns: %s", missing)
 
-    # Keep only mapped columns + geometry
+    # Keep only mapped columns + geometry.  The .loc selection already
+    # returns a new, independent frame, so rename its labels in place
+    # rather than copying the data again.
     keep = list(available) + ["geometry"]
-    gdf = gdf[keep].copy()
-    rename_map = {src: dst for src, dst in col_map.items() if src in available}
-    gdf = gdf.rename(columns=rename_map)
+    gdf = gdf.loc[:, keep]
+    gdf.columns = [col_map.get(c, c) for c in keep]
     return gdf
 
 
+# pandas dtype each PostgreSQL column type is cast to before encoding
+_PG_DTYPES = {
+    "smallint": "Int64",
+    "integer": "Int64",
+    "bigint": "Int64",
+    "real": "float64",
+    "double precision": "float64",
+    "character varying": "string",
+    "text": "string",
+}
+
+# Binary COPY encoding (field length, value) of fixed-width column types
+_PG_BINARY_STRUCTS = {
+    "smallint": struct.Struct(">ih"),
+    "integer": struct.Struct(">ii"),
+    "bigint": struct.Struct(">iq"),
+    "real": struct.Struct(">if"),
+    "double precision": struct.Struct(">id"),
+    "boolean": struct.Struct(">i?"),
+}
+
+_PG_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_PG_COPY_TRAILER = struct.pack(">h", -1)
+_PG_NULL = struct.pack(">i", -1)
+
+
+def _column_types(cur, table_name: str) -> dict[str, str]:
+    """Map each column of *table_name* to its PostgreSQL type name."""
+    cur.execute(
+        "SELECT column_name, data_type, udt_name "
+        "FROM information_schema.columns "
+        "WHERE table_schema = current_schema() AND table_name = %s",
+        (table_name,),
+    )
+    return {
+        name: udt_name if data_type == "USER-DEFINED" else data_type
+        for name, data_type, udt_name in cur.fetchall()
+    }
+
+
+def _encode_binary_field(values, nulls, pg_type: str) -> list[bytes]:
+    """Encode one column as binary COPY fields (length prefix + value)."""
+    packer = _PG_BINARY_STRUCTS.get(pg_type)
+    if packer is not None:
+        size = packer.size - 4
+        return [_PG_NULL if null else packer.pack(size, value)
+                for value, null in zip(values, nulls)]
+    if pg_type in ("character varying", "text", "geometry"):
+        fields = []
+        for value, null in zip(values, nulls):
+            if null:
+                fields.append(_PG_NULL)
+            else:
+                data = value if isinstance(value, bytes) else value.encode()
+                fields.append(len(data).to_bytes(4, "big") + data)
+        return fields
+    raise ValueError(f"No binary COPY encoding for column type {pg_type!r}")
+
+
+def _binary_copy_buffer(frame: pd.DataFrame, column_types: dict[str, str]
+                        ) -> io.BytesIO:
+    """Serialise *frame* in PostgreSQL's binary COPY format.
+
+    Values are sent in each column type's wire format (geometry as raw
+    EWKB), so the server does no text parsing on input.
+    """
+    columns = [
+        _encode_binary_field(
+            frame[col].to_numpy(dtype=object),
+            frame[col].isna().to_numpy(),
+            column_types[col],
+        )
+        for col in frame.columns
+    ]
+    field_count = struct.pack(">h", len(columns))
+    buf = io.BytesIO()
+    buf.write(_PG_COPY_HEADER)
+    for fields in zip(*columns):
+        buf.write(field_count)
+        buf.write(b"".join(fields))
+    buf.write(_PG_COPY_TRAILER)
+    buf.seek(0)
+    return buf
+
+
+def _drop_secondary_indexes(cur, table_name: str) -> list[str]:
+    """Drop the indexes on *table_name* not backing a constraint.
+
+    Returns their ``CREATE INDEX`` definitions so they can be rebuilt.
+    Primary-key and unique-constraint indexes are left in place.
+    """
+    cur.execute(
+        "SELECT i.indexname, i.indexdef FROM pg_indexes i "
+        "WHERE i.schemaname = current_schema() AND i.tablename = %s "
+        "AND NOT EXISTS ("
+        "  SELECT 1 FROM pg_constraint c WHERE c.conindid = "
+        "  (quote_ident(i.schemaname) || '.' || quote_ident(i.indexname))"
+        "  ::regclass"
+        ")",
+        (table_name,),
+    )
+    indexes = cur.fetchall()
+    for index_name, _ in indexes:
+        log.info("Dropping index %s for bulk load", index_name)
+        cur.execute(f'DROP INDEX "{index_name}"')
+    return [index_def for _, index_def in indexes]
+
+
 def _write_to_postgis(
-    gdf: gpd.GeoDataFrame,
+    frames: Iterable[gpd.GeoDataFrame],
     table_name: str,
     engine,
-    chunksize: int = 5000,
     geom_col: str = "geom",
 ) -> None:
-    """Write a GeoDataFrame to a PostGIS table using append mode.
-
-    The migration creates geometry columns named ``geom``, so we rename the
-    GeoDataFrame's active geometry column to match before writing.  This
-    ensures ``Find_SRID()`` resolves against the registered column name.
+    """Append GeoDataFrame batches to a PostGIS table with ``COPY FROM STDIN``.
+
+    Rows are sent in the binary COPY format, with geometries as raw EWKB
+    (SRID embedded), so they stream in without per-row INSERTs or any
+    text parsing on the server.  Each batch is encoded and copied as it
+    arrives, and all batches are
+    committed in a single transaction so a failed import leaves the table
+    empty (and due for re-import).
+
+    The table is truncated at the start of the transaction and
+    secondary indexes (e.g. the GiST index on ``geom``) are dropped for
+    the load and rebuilt once at the end, in the same transaction, so a
+    rollback restores them untouched.
     """
-    # Rename the geometry column to match the DB schema
-    src_geom = gdf.geometry.name  # usually 'geometry'
-    if src_geom != geom_col:
-        gdf = gdf.rename_geometry(geom_col)
-
-    log.info("Writing %d rows to %s (chunksize=%d)", len(gdf), table_name, chunksize)
-    gdf.to_postgis(
-        table_name,
-        engine,
-        if_exists="append",
-        index=False,
-        chunksize=chunksize,
-    )
-    log.info("Finished writing %s", table_name)
+    n_rows = 0
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL synchronous_commit = off")
+            cur.execute("SET LOCAL maintenance_work_mem = '1GB'")
+            # Truncating in the loading transaction lets the server skip
+            # WAL for the COPY when running with wal_level=minimal, and
+            # clears any rows left by a partial run outside this loader
+            cur.execute(f"TRUNCATE {table_name}")
+            index_defs = _drop_secondary_indexes(cur, table_name)
+            column_types = _column_types(cur, table_name)
+            dtypes = {
+                col: _PG_DTYPES[pg_type]
+                for col, pg_type in column_types.items()
+                if pg_type in _PG_DTYPES
+            }
+
+            for gdf in frames:
+                if gdf.empty:
+                    continue
+                srid = gdf.crs.to_epsg() if gdf.crs is not None else 4326
+                frame = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+                frame = frame.astype({
+                    col: dtypes[col] for col in frame.columns if col in dtypes
+                })
+                frame[geom_col] = shapely.to_wkb(
+                    shapely.set_srid(gdf.geometry.to_numpy(), srid),
+                    include_srid=True,
+                )
+
+                columns = ", ".join(f'"{c}"' for c in frame.columns)
+                cur.copy_expert(
+                    f"COPY {table_name} ({columns}) FROM STDIN "
+                    f"WITH (FORMAT binary)",
+                    _binary_copy_buffer(frame, column_types),
+                )
+                n_rows += len(frame)
+                log.info("Copied %d rows to %s", n_rows, table_name)
+
+            for index_def in index_defs:
+                log.info("Rebuilding index: %s", index_def)
+                cur.execute(index_def)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    log.info("Finished writing %d rows to %s", n_rows, table_name)
 
 
 # ---------------------------------------------------------------------------
@@ -223,117 +630,130 @@ def _write_to_postgis(
 # ---------------------------------------------------------------------------
 
 
-def import_geoboundaries(engine, adm_level: int, tmpdir: Path) -> None:
-    """Download and import a single geoBoundaries CGAZ admin level."""
-    table = f"geoboundaries_adm{adm_level}"
-    url = DOWNLOAD_URLS[table]
+def fetch_dataset(table_name: str, use_cache: bool = True) -> Path:
+    """Return a local (possibly cached) copy of *table_name*'s source file."""
+    return _get(DOWNLOAD_URLS[table_name], DOWNLOAD_FILENAMES[table_name],
+                use_cache)
+
 
-    dest = tmpdir / f"geoBoundariesCGAZ_ADM{adm_level}.gpkg"
-    _download(url, dest)
+def import_geoboundaries(engine, adm_level: int, path: Path) -> None:
+    """Import a single downloaded geoBoundaries CGAZ admin level."""
+    table = f"geoboundaries_adm{adm_level}"
 
-    gdf = _load_geopackage(dest)
     col_map = GEOBOUNDARIES_COL_MAP_ADM0 if adm_level == 0 else GEOBOUNDARIES_COL_MAP
-    gdf = _select_and_rename(gdf, col_map)
-    gdf = _ensure_multipolygon(gdf)
-    gdf = gdf.set_crs(epsg=4326, allow_override=True)
-
-    _write_to_postgis(gdf, table, engine)
-
-
-def import_ecoregions(engine, tmpdir: Path) -> None:
-    """Download and import RESOLVE Ecoregions."""
-    dest = tmpdir / "resolve_ecoregions.gpkg"
-    _download(DOWNLOAD_URLS["ecoregions"], dest)
-
-    gdf = _load_geopackage(dest)
-    gdf = _select_and_rename(gdf, ECOREGION_COL_MAP)
-    # Source data stores integer fields as floats – cast to int for Postgres
-    for col in ("eco_id", "biome_num"):
-        if col in gdf.columns:
-            gdf[col] = gdf[col].astype("Int64")  # nullable integer
-    gdf = _ensure_multipolygon(gdf)
-    gdf = gdf.set_crs(epsg=4326, allow_override=True)
-
-    _write_to_postgis(gdf, "ecoregions", engine)
-
-
-def import_wdpa(engine, tmpdir: Path) -> None:
-    """Download and import WDPA protected areas (polygon layer only)."""
-    dest = tmpdir / "wdpa.zip"
-    _download(DOWNLOAD_URLS["wdpa"], dest)
-
-    # Extract the zip
-    extract_dir = tmpdir / "wdpa_extract"
-    log.info("Extracting %s", dest)
-    with zipfile.ZipFile(dest, "r") as zf:
-        zf.extractall(extract_dir)
-
-    # Find the polygon layer – could be a GeoPackage, shapefile, or GDB
-    # Try common patterns
-    gdf = None
-
-    # Log what was extracted to aid debugging
-    extracted_files = list(extract_dir.rglob("*"))
-    log.info("Extracted %d items; top-level: %s",
-             len(extracted_files),
-             [p.name for p in extract_dir.iterdir()])
-
-    # Check for File GeoDatabase (.gdb directory) first
-    gdb_dirs = list(extract_dir.rglob("*.gdb"))
-    if gdb_dirs:
-        gdb_path = gdb_dirs[0]
-        log.info("Found GeoDatabase: %s", gdb_path)
-        try:
-            import fiona
-
-            layers = fiona.listlayers(gdb_path)
-            log.info("Available layers: %s", layers)
-            poly_layer = None
-            for lyr in layers:
-                if "poly" in lyr.lower() or "polygon" in lyr.lower():
-                    poly_layer = lyr
-                    break
-            gdf = _load_geopackage(gdb_path, layer=poly_layer)
-        except Exception:
-            gdf = _load_geopackage(gdb_path)
-
-    # Fall back to GeoPackage / Shapefile patterns
-    if gdf is None:
-        for pattern in ["**/*Polygons*.gpkg", "**/*polygons*.gpkg",
-                        "**/*Polygons*.shp", "**/*polygons*.shp",
-                        "**/*.gpkg", "**/*.shp"]:
-            matches = list(extract_dir.glob(pattern))
-            if matches:
-                fpath = matches[0]
-                log.info("Found vector file: %s", fpath)
-                try:
-                    import fiona
-
-                    layers = fiona.listlayers(fpath)
-                    log.info("Available layers: %s", layers)
-                    poly_layer = None
-                    for lyr in layers:
-                        if "poly" in lyr.lower() or "polygon" in lyr.lower():
-                            poly_layer = lyr
-                            break
-                    gdf = _load_geopackage(fpath, layer=poly_layer)
-                except Exception:
-                    gdf = _load_geopackage(fpath)
+
+    def _batches():
+        for gdf in _iter_features(path, columns=col_map):
+            gdf = _select_and_rename(gdf, col_map)
+            gdf = _ensure_multipolygon(gdf)
+            yield _to_wgs84(gdf)
+
+    _write_to_postgis(_batches(), table, engine)
+
+
+def import_ecoregions(engine, path: Path) -> None:
+    """Import downloaded RESOLVE Ecoregions."""
+    def _batches():
+        for gdf in _iter_features(path, columns=ECOREGION_COL_MAP):
+            # Integer fields stored as floats in the source are cast to the
+            # table's INTEGER columns by _write_to_postgis
+            gdf = _select_and_rename(gdf, ECOREGION_COL_MAP)
+            gdf = _ensure_multipolygon(gdf)
+            yield _to_wgs84(gdf)
+
+    _write_to_postgis(_batches(), "ecoregions", engine)
+
+
+def import_wdpa(engine, path: Path) -> None:
+    """Import downloaded WDPA protected areas (polygon layer only)."""
+    # The zip may live in the persistent download cache; extract it to a
+    # temporary directory that is removed once the import is done
+    extract_dir = Path(tempfile.mkdtemp(prefix="wdpa_extract_"))
+    try:
+        _import_wdpa_extract(engine, path, extract_dir)
+    finally:
+        shutil.rmtree(extract_dir, ignore_errors=True)
+
+
+def _wdpa_members(names: list[str]) -> tuple[str, list[str]] | None:
+    """Pick the WDPA polygon source among zip member *names*.
+
+    Returns ``(source, members)``: the path (relative to the archive root)
+    to open, and the archive members needed to read it.  Prefers a File
+    GeoDatabase, then files named like a polygon layer, then any
+    GeoPackage / Shapefile.  Returns None if there is no vector source.
+    """
+    gdbs: list[str] = []
+    by_ext: dict[str, list[str]] = defaultdict(list)
+    for name in names:
+        parts = PurePosixPath(name).parts
+        for i, part in enumerate(parts[:-1]):
+            if part.lower().endswith(".gdb"):
+                gdb = "/".join(parts[:i + 1])
+                if gdb not in gdbs:
+                    gdbs.append(gdb)
                 break
+        else:
+            by_ext[PurePosixPath(name).suffix.lower()].append(name)
+
+    if gdbs:
+        source = gdbs[0]
+        log.info("Found GeoDatabase: %s", source)
+        return source, [n for n in names if n.startswith(source + "/")]
+
+    candidates = [
+        *(n for n in by_ext[".gpkg"] if _POLYGON_NAME.search(n)),
+        *(n for n in by_ext[".shp"] if _POLYGON_NAME.search(n)),
+        *by_ext[".gpkg"],
+        *by_ext[".shp"],
+    ]
+    if not candidates:
+        return None
+    source = candidates[0]
+    log.info("Found vector file: %s", source)
+    if not source.lower().endswith(".shp"):
+        return source, [source]
+    # A shapefile needs its sidecars (.shx, .dbf, .prj, .cpg, ...)
+    stem = source[:-len(".shp")]
+    return source, [n for n in names if n.rsplit(".", 1)[0] == stem]
+
+
+def _import_wdpa_extract(engine, path: Path, extract_dir: Path) -> None:
+    """Extract the WDPA polygon layer into *extract_dir* and import it.
+
+    Only the members making up the chosen layer are decompressed; the
+    rest of the archive (points layer, metadata, documentation) is
+    skipped.
+    """
+    with zipfile.ZipFile(path, "r") as zf:
+        names = [n for n in zf.namelist() if not n.endswith("/")]
+        log.info("Archive has %d members; top-level: %s", len(names),
+                 sorted({n.split("/", 1)[0] for n in names}))
+
+        # Find the polygon layer – could be a GeoPackage, shapefile, or GDB
+        found = _wdpa_members(names)
+        if found is None:
+            raise RuntimeError(
+                f"Could not find a supported vector file in {path}. "
+                f"Contents: {sorted({n.split('/', 1)[0] for n in names})}"
+            )
+        source_name, members = found
+        log.info("Extracting %d member(s) from %s", len(members), path)
+        for member in members:
+            zf.extract(member, extract_dir)
 
-    if gdf is None:
-        raise RuntimeError(
-            f"Could not find a supported vector file in {extract_dir}. "
-            f"Contents: {[p.name for p in extract_dir.iterdir()]}"
-        )
+    source = extract_dir / source_name
+    layer = _find_polygon_layer(source)
 
-    gdf = _select_and_rename(gdf, WDPA_COL_MAP)
-    # Drop rows without geometry (WDPA can include point records)
-    gdf = gdf[~gdf.geometry.is_empty & gdf.geometry.notna()]
-    gdf = _ensure_multipolygon(gdf)
-    gdf = gdf.set_crs(epsg=4326, allow_override=True)
+    def _batches():
+        for gdf in _iter_features(source, layer=layer, columns=WDPA_COL_MAP):
+            gdf = _select_and_rename(gdf, WDPA_COL_MAP)
+            gdf = _ensure_multipolygon(gdf)
+            # Drop rows without geometry (WDPA can include point records)
+            gdf = gdf[~gdf.geometry.is_empty & gdf.geometry.notna()]
+            yield _to_wgs84(gdf)
 
-    _write_to_postgis(gdf, "wdpa", engine, chunksize=2000)
+    _write_to_postgis(_batches(), "wdpa", engine)
 
 
 # ---------------------------------------------------------------------------
@@ -342,28 +762,45 @@ def import_wdpa(engine, tmpdir: Path) -> None:
 
 
 DATASETS = [
-    ("geoboundaries_adm0", lambda eng, tmp: import_geoboundaries(eng, 0, tmp)),
-    ("geoboundaries_adm1", lambda eng, tmp: import_geoboundaries(eng, 1, tmp)),
-    ("geoboundaries_adm2", lambda eng, tmp: import_geoboundaries(eng, 2, tmp)),
+    ("geoboundaries_adm0",
+     lambda eng, path: import_geoboundaries(eng, 0, path)),
+    ("geoboundaries_adm1",
+     lambda eng, path: import_geoboundaries(eng, 1, path)),
+    ("geoboundaries_adm2",
+     lambda eng, path: import_geoboundaries(eng, 2, path)),
     ("ecoregions", import_ecoregions),
     ("wdpa", import_wdpa),
 ]
 
 
-def run_import(check_only: bool = False) -> None:
-    """Check each table and import data where missing."""
-    engine = create_engine(Config.DATABASE_URL)
+def run_import(check_only: bool = False, use_cache: bool = True) -> None:
+    """Check each table and import data where missing.
+
+    Source files are reused from the download cache unless *use_cache*
+    is False.
+    """
+    # One pooled connection per concurrent load; pre-ping replaces any
+    # that dropped while idle during a long download
+    engine = create_engine(
+        Config.DATABASE_URL, pool_size=MAX_INGEST_WORKERS, pool_pre_ping=True,
+    )
 
     needed = []
-    for table_name, _ in DATASETS:
-        if not _table_exists(engine, table_name):
-            log.warning("Table %s does not exist – run migrations first", table_name)
-            continue
-        if _table_is_empty(engine, table_name):
-            log.info("Table %s is empty – import needed", table_name)
-            needed.append((table_name, _))
-        else:
-            log.info("Table %s already has data – skipping", table_name)
+    with engine.connect() as conn:
+        existing = _existing_tables(conn, [t for t, _ in DATASETS])
+        populated = _tables_with_data(
+            conn, [t for t, _ in DATASETS if t in existing]
+        )
+        for table_name, _ in DATASETS:
+            if table_name not in existing:
+                log.warning("Table %s does not exist – run migrations first",
+                            table_name)
+                continue
+            if table_name not in populated:
+                log.info("Table %s is empty – import needed", table_name)
+                needed.append((table_name, _))
+            else:
+                log.info("Table %s already has data – skipping", table_name)
 
     if check_only:
         if needed:
@@ -378,24 +815,47 @@ def run_import(check_only: bool = False) -> None:
         log.info("All vector reference tables already populated – nothing to do")
         return
 
-    tmpdir = Path(tempfile.mkdtemp(prefix="vector_import_"))
-    try:
-        for table_name, importer in needed:
-            log.info("=" * 60)
-            log.info("Importing %s", table_name)
-            log.info("=" * 60)
+    # Fetch all needed archives concurrently (network bound) and hand
+    # each one to the ingest pool as soon as its download finishes, so
+    # tables load in parallel on separate connections while the remaining
+    # downloads continue
+    importers = dict(needed)
+
+    def _ingest(table_name: str, path: Path) -> None:
+        log.info("Importing %s", table_name)
+        importers[table_name](engine, path)
+        log.info("Imported %s", table_name)
+
+    n_workers = len(needed)
+    n_fetch = min(MAX_DOWNLOAD_WORKERS, n_workers)
+    n_ingest = min(MAX_INGEST_WORKERS, n_workers)
+    with ThreadPoolExecutor(n_fetch) as fetch_pool, \
+            ThreadPoolExecutor(n_ingest) as ingest_pool:
+        downloads = {
+            fetch_pool.submit(fetch_dataset, table_name, use_cache): table_name
+            for table_name, _ in needed
+        }
+
+        ingests = {}
+        for future in as_completed(downloads):
+            table_name = downloads[future]
+            try:
+                path = future.result()
+            except Exception:
+                log.exception("Failed to download %s", table_name)
+                continue
+            ingests[ingest_pool.submit(_ingest, table_name, path)] = table_name
+
+        for future in as_completed(ingests):
             try:
-                importer(engine, tmpdir)
+                future.result()
             except Exception:
-                log.exception("Failed to import %s", table_name)
+                log.exception("Failed to import %s", ingests[future])
                 # Continue with remaining datasets
-    finally:
-        log.info("Cleaning up temp directory %s", tmpdir)
-        shutil.rmtree(tmpdir, ignore_errors=True)
 
     log.info("Vector data import complete")
 
 
 if __name__ == "__main__":
     check_flag = "--check" in sys.argv
-    run_import(check_only=check_flag)
+    run_import(check_only=check_flag, use_cache="--no-cache" not in sys.argv)
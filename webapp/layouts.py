@@ -5,15 +5,16 @@ admin panel, and navigation components. Uses AG Grid for sortable/filterable
 tables following the same patterns as the trends.earth-api-ui.
 """
 
-import importlib.util
-import os
+import functools
 
 import dash_ag_grid as dag
 import dash_bootstrap_components as dbc
 from dash import dcc, html
 
+from services import CATEGORY_LABELS, load_gee_config
+
 # Default covariates for the matching formula
-DEFAULT_COVARIATES = [
+DEFAULT_COVARIATES = (
     "lc_2015_agriculture",
     "precip",
     "temp",
@@ -25,10 +26,10 @@ DEFAULT_COVARIATES = [
     "pop_2015",
     "pop_growth",
     "total_biomass",
-]
+)
 
 # All available covariates (matching + additional options)
-ALL_COVARIATES = DEFAULT_COVARIATES + [
+ALL_COVARIATES = DEFAULT_COVARIATES + (
     "lc_2015_forest",
     "lc_2015_grassland",
     "lc_2015_wetlands",
@@ -39,10 +40,26 @@ ALL_COVARIATES = DEFAULT_COVARIATES + [
     "pop_2005",
     "pop_2010",
     "pop_2020",
-]
+)
+
+# Built once and shared (read-only) by every submit page render
+COVARIATE_OPTIONS = tuple({"label": c, "value": c} for c in ALL_COVARIATES)
+
+ROLE_OPTIONS = (
+    {"label": "User", "value": "user"},
+    {"label": "Admin", "value": "admin"},
+)
 
 # -- Column definitions (AG Grid) -------------------------------------------
 
+# One condition per column filter (no second and/or condition UI in the
+# popup), and typed filters fire once typing pauses instead of per key.
+# maxNumConditions replaces suppressAndOrCondition in AG Grid 31.
+DEFAULT_FILTER_PARAMS = {
+    "maxNumConditions": 1,
+    "debounceMs": 300,
+}
+
 TRUNCATED_CELL = {
     "whiteSpace": "nowrap",
     "overflow": "hidden",
@@ -68,6 +85,7 @@ TASK_LIST_COLUMNS = [
         "cellStyle": {"fontSize": "12px"},
         "filter": "agTextColumnFilter",
         "filterParams": {
+            **DEFAULT_FILTER_PARAMS,
             "buttons": ["clear", "apply"],
             "closeOnApply": True,
         },
@@ -108,6 +126,9 @@ TASK_LIST_COLUMNS = [
     },
 ]
 
+# Fixed widths rather than flex: the grid is wider than the viewport and
+# scrolls horizontally, and fixed widths spare AG Grid re-measuring every
+# rendered column (and its cell renderers) while scrolling
 COVARIATE_COLUMNS = [
     {
         "headerName": "Covariate",
@@ -115,7 +136,7 @@ COVARIATE_COLUMNS = [
         "checkboxSelection": True,
         "headerCheckboxSelection": True,
         "headerCheckboxSelectionFilteredOnly": True,
-        "flex": 2,
+        "width": 220,
         "minWidth": 200,
         "pinned": "left",
         "cellStyle": {**TRUNCATED_CELL},
@@ -124,14 +145,14 @@ COVARIATE_COLUMNS = [
     {
         "headerName": "Category",
         "field": "category",
-        "flex": 1.2,
+        "width": 130,
         "minWidth": 120,
         "filter": "agTextColumnFilter",
     },
     {
         "headerName": "Status",
         "field": "status",
-        "flex": 1,
+        "width": 120,
         "minWidth": 110,
         "cellRenderer": "StatusBadge",
         "filter": "agTextColumnFilter",
@@ -139,7 +160,7 @@ COVARIATE_COLUMNS = [
     {
         "headerName": "GEE Task ID",
         "field": "gee_task_id",
-        "flex": 1.5,
+        "width": 170,
         "minWidth": 150,
         "cellStyle": {**TRUNCATED_CELL, "fontSize": "11px"},
         "tooltipField": "gee_task_id",
@@ -147,30 +168,30 @@ COVARIATE_COLUMNS = [
     {
         "headerName": "GCS Tiles",
         "field": "gcs_tiles",
-        "flex": 0.7,
+        "width": 90,
         "minWidth": 85,
         "cellRenderer": "TileCount",
     },
     {
         "headerName": "On S3",
         "field": "on_s3",
-        "flex": 0.5,
+        "width": 70,
         "minWidth": 65,
         "cellRenderer": "S3Status",
     },
     {
         "headerName": "Size (MB)",
         "field": "size_mb",
-        "flex": 0.8,
+        "width": 100,
         "minWidth": 90,
         "filter": "agNumberColumnFilter",
-        "valueFormatter": {"function": "params.value ? d3.format(',.1f')(params.value) : ''"},
+        "valueFormatter": {"function": "fmt1OrBlank(params)"},
         "type": "numericColumn",
     },
     {
         "headerName": "Merged URL",
         "field": "merged_url",
-        "flex": 2.5,
+        "width": 280,
         "minWidth": 250,
         "cellRenderer": "CogLink",
         "cellStyle": {**TRUNCATED_CELL, "fontSize": "11px"},
@@ -179,7 +200,7 @@ COVARIATE_COLUMNS = [
     {
         "headerName": "Error",
         "field": "error_message",
-        "flex": 2,
+        "width": 240,
         "minWidth": 200,
         "cellStyle": {**TRUNCATED_CELL, "fontSize": "11px", "color": "#721C24"},
         "tooltipField": "error_message",
@@ -187,7 +208,7 @@ COVARIATE_COLUMNS = [
     {
         "headerName": "Actions",
         "field": "actions",
-        "flex": 1.5,
+        "width": 170,
         "minWidth": 170,
         "cellRenderer": "CovariateActions",
         "sortable": False,
@@ -220,7 +241,7 @@ RESULTS_TOTAL_COLUMNS = [
         "flex": 1.5,
         "minWidth": 180,
         "filter": "agNumberColumnFilter",
-        "valueFormatter": {"function": "d3.format(',.1f')(params.value)"},
+        "valueFormatter": {"function": "fmt1(params)"},
         "type": "numericColumn",
         "sort": "desc",
         "sortIndex": 0,
@@ -231,7 +252,7 @@ RESULTS_TOTAL_COLUMNS = [
         "flex": 1.5,
         "minWidth": 170,
         "filter": "agNumberColumnFilter",
-        "valueFormatter": {"function": "d3.format(',.1f')(params.value)"},
+        "valueFormatter": {"function": "fmt1(params)"},
         "type": "numericColumn",
     },
     {
@@ -240,7 +261,7 @@ RESULTS_TOTAL_COLUMNS = [
         "flex": 1,
         "minWidth": 110,
         "filter": "agNumberColumnFilter",
-        "valueFormatter": {"function": "d3.format(',.0f')(params.value)"},
+        "valueFormatter": {"function": "fmt0(params)"},
         "type": "numericColumn",
     },
     {
@@ -275,7 +296,7 @@ RESULTS_YEARLY_COLUMNS = [
         "flex": 1.5,
         "minWidth": 180,
         "filter": "agNumberColumnFilter",
-        "valueFormatter": {"function": "d3.format(',.1f')(params.value)"},
+        "valueFormatter": {"function": "fmt1(params)"},
         "type": "numericColumn",
     },
     {
@@ -284,7 +305,7 @@ RESULTS_YEARLY_COLUMNS = [
         "flex": 1.5,
         "minWidth": 170,
         "filter": "agNumberColumnFilter",
-        "valueFormatter": {"function": "d3.format(',.1f')(params.value)"},
+        "valueFormatter": {"function": "fmt1(params)"},
         "type": "numericColumn",
     },
     {
@@ -293,7 +314,7 @@ RESULTS_YEARLY_COLUMNS = [
         "flex": 1,
         "minWidth": 120,
         "filter": "agNumberColumnFilter",
-        "valueFormatter": {"function": "d3.format(',')(params.value)"},
+        "valueFormatter": {"function": "fmt0(params)"},
         "type": "numericColumn",
     },
 ]
@@ -370,92 +391,37 @@ DEFAULT_GRID_OPTIONS = {
     "alwaysShowHorizontalScroll": True,
     "rowHeight": 32,
     "headerHeight": 32,
+    # Render few rows outside the viewport and never mount off-screen
+    # rows or columns: most rows carry custom cell renderers
+    "rowBuffer": 5,
+    "suppressRowVirtualisation": False,
+    "suppressColumnVirtualisation": False,
 }
 
+# Grid options that would mount every row or column.  _make_ag_grid
+# rejects these, and column autoHeight, which silently turns column
+# virtualisation off
+_VIRTUALISATION_BREAKERS = (
+    "suppressRowVirtualisation",
+    "suppressColumnVirtualisation",
+)
+
 DEFAULT_COL_DEF = {
     "resizable": True,
     "sortable": True,
     "filter": True,
+    "filterParams": DEFAULT_FILTER_PARAMS,
     "minWidth": 50,
     "suppressSizeToFit": True,
-    "wrapText": True,
+    # Rows are a fixed 32px, so wrapped text would only be clipped; keep
+    # cells on one line (ellipsised) and skip AG Grid's wrap measurement
+    "wrapText": False,
     "autoHeight": False,
 }
 
-TASK_STATUS_ROW_STYLES = [
-    {
-        "condition": "params.data.status === 'failed'",
-        "style": {"backgroundColor": "#F8D7DA", "color": "#721C24"},
-    },
-    {
-        "condition": "params.data.status === 'succeeded'",
-        "style": {"backgroundColor": "#D1E7DD", "color": "#0F5132"},
-    },
-    {
-        "condition": "params.data.status === 'running'",
-        "style": {"backgroundColor": "#CCE5FF", "color": "#084298"},
-    },
-    {
-        "condition": "params.data.status === 'submitted'",
-        "style": {"backgroundColor": "#FFF3CD", "color": "#664D03"},
-    },
-    {
-        "condition": "params.data.status === 'pending'",
-        "style": {"backgroundColor": "#E2E3E5", "color": "#495057"},
-    },
-]
-
-COVARIATE_STATUS_ROW_STYLES = [
-    # Greyed-out: nothing anywhere
-    {
-        "condition": "(!params.data.gcs_tiles || params.data.gcs_tiles === 0) && !params.data.on_s3 && !params.data.status",
-        "style": {"backgroundColor": "#F5F5F5", "color": "#AAAAAA"},
-    },
-    # Export phase
-    {
-        "condition": "params.data.status === 'pending_export'",
-        "style": {"backgroundColor": "#E2E3E5", "color": "#495057"},
-    },
-    {
-        "condition": "params.data.status === 'exporting'",
-        "style": {"backgroundColor": "#CCE5FF", "color": "#084298"},
-    },
-    {
-        "condition": "params.data.status === 'exported'",
-        "style": {"backgroundColor": "#FFF3CD", "color": "#664D03"},
-    },
-    # Merge phase
-    {
-        "condition": "params.data.status === 'pending_merge'",
-        "style": {"backgroundColor": "#E2E3E5", "color": "#495057"},
-    },
-    {
-        "condition": "params.data.status === 'merging'",
-        "style": {"backgroundColor": "#CCE5FF", "color": "#084298"},
-    },
-    # Merged / on S3
-    {
-        "condition": "params.data.on_s3 && !params.data.status",
-        "style": {"backgroundColor": "#D1E7DD", "color": "#0F5132"},
-    },
-    {
-        "condition": "params.data.status === 'merged'",
-        "style": {"backgroundColor": "#D1E7DD", "color": "#0F5132"},
-    },
-    # Failed / cancelled
-    {
-        "condition": "params.data.status === 'failed'",
-        "style": {"backgroundColor": "#F8D7DA", "color": "#721C24"},
-    },
-    {
-        "condition": "params.data.status === 'cancelled'",
-        "style": {"backgroundColor": "#F8D7DA", "color": "#721C24"},
-    },
-]
-
 
 def _make_ag_grid(table_id, column_defs, *, row_model="clientSide",
-                  height="600px", style_conditions=None,
+                  height="600px", row_class=None, row_id=None,
                   grid_options_extra=None, row_data=None):
     """Create an AG Grid component using api-ui conventions.
 
@@ -464,13 +430,26 @@ def _make_ag_grid(table_id, column_defs, *, row_model="clientSide",
         column_defs: list of AG-Grid column definitions.
         row_model: 'clientSide' or 'infinite'.
         height: CSS height string.
-        style_conditions: optional row-style conditions list.
+        row_class: optional name of a function in
+            ``assets/dashAgGridFunctions.js`` returning each row's CSS class.
+        row_id: optional field that uniquely identifies a row.
         grid_options_extra: dict merged into DEFAULT_GRID_OPTIONS.
         row_data: initial row data (clientSide mode only).
     """
-    grid_opts = {**DEFAULT_GRID_OPTIONS}
-    if grid_options_extra:
-        grid_opts.update(grid_options_extra)
+    # Grids without extra options or a row class share the (never mutated)
+    # defaults instead of each carrying a copy
+    grid_opts = DEFAULT_GRID_OPTIONS
+    if grid_options_extra or row_class:
+        grid_opts = {**DEFAULT_GRID_OPTIONS, **(grid_options_extra or {})}
+    disabled = [opt for opt in _VIRTUALISATION_BREAKERS if grid_opts[opt]]
+    disabled += [
+        f"autoHeight on {col.get('field')}"
+        for col in column_defs if col.get("autoHeight")
+    ]
+    if disabled:
+        raise ValueError(
+            f"Grid {table_id} would disable virtualisation: {disabled}"
+        )
 
     kwargs = {
         "id": table_id,
@@ -482,8 +461,15 @@ def _make_ag_grid(table_id, column_defs, *, row_model="clientSide",
         "className": "ag-theme-alpine",
     }
 
-    if style_conditions:
-        kwargs["getRowStyle"] = {"styleConditions": style_conditions}
+    if row_class:
+        # One class lookup per row instead of evaluating a chain of
+        # getRowStyle conditions
+        grid_opts["getRowClass"] = {"function": f"{row_class}(params)"}
+
+    if row_id:
+        # With stable row ids AG Grid applies new rowData as a delta,
+        # re-rendering only rows that were added, removed or changed
+        kwargs["getRowId"] = f"params.data.{row_id}"
 
     if row_data is not None and row_model == "clientSide":
         kwargs["rowData"] = row_data
@@ -491,25 +477,59 @@ def _make_ag_grid(table_id, column_defs, *, row_model="clientSide",
     return dag.AgGrid(**kwargs)
 
 
+# Grids rendered without row data are identical on every page load, so
+# each is built once per process and shared by all later layout calls
+_STATIC_GRIDS = {}
+
+
+def _static_grid(table_id, column_defs, **kwargs):
+    """Return the cached row-less grid *table_id*, building it on first use.
+
+    Only for grids whose configuration never changes between renders:
+    the arguments of the first call define the grid for the process.
+    """
+    grid = _STATIC_GRIDS.get(table_id)
+    if grid is None:
+        grid = _STATIC_GRIDS.setdefault(
+            table_id, _make_ag_grid(table_id, column_defs, **kwargs),
+        )
+    return grid
+
+
 # -- Navigation bar ----------------------------------------------------------
 
+def _user_key(user):
+    """The parts of *user* that page chrome depends on, as a cache key."""
+    if user is None:
+        return None, False
+    return user.name, bool(user.is_admin)
+
+
 def navbar(user=None):
     """Top navigation bar."""
+    return _navbar(*_user_key(user))
+
+
+# The navbar only varies with the signed-in user's name and role, so each
+# variant is built once and shared by every page render (like _static_grid)
+@functools.lru_cache(maxsize=64)
+def _navbar(user_name, is_admin):
+    """Build the navbar for *user_name* (``None`` when signed out)."""
     nav_items = [
         dbc.NavItem(dbc.NavLink("Dashboard", href="/")),
         dbc.NavItem(dbc.NavLink("Submit Task", href="/submit")),
         dbc.NavItem(dbc.NavLink("Settings", href="/settings")),
     ]
-    if user and user.is_admin:
+    if is_admin:
         nav_items.append(
             dbc.NavItem(dbc.NavLink("Admin", href="/admin"))
         )
 
     right_items = []
-    if user:
+    if user_name is not None:
         right_items = [
             dbc.NavItem(
-                dbc.NavLink(user.name, disabled=True, className="text-light")
+                dbc.NavLink(user_name, disabled=True, className="text-light")
             ),
             dbc.NavItem(dbc.NavLink("Logout", href="/logout")),
         ]
@@ -534,6 +554,37 @@ def navbar(user=None):
 
 # -- Page layouts ------------------------------------------------------------
 
+def _to_plain_json(value):
+    """Recursively convert a component tree to plain JSON-ready data."""
+    if hasattr(value, "to_plotly_json"):
+        value = value.to_plotly_json()
+    if isinstance(value, dict):
+        return {k: _to_plain_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_plain_json(v) for v in value]
+    return value
+
+
+def _prerendered(maxsize):
+    """Cache a layout builder's tree, pre-converted to plain JSON data.
+
+    Dash encodes responses with orjson, which only falls back to walking
+    the tree in Python (``to_plotly_json`` on every node) when it meets
+    an object it cannot encode.  Pages without per-request content are
+    therefore built once and stored as plain dicts/lists, so each later
+    response is encoded in a single C-level pass.  The cached data is
+    shared between requests and must not be mutated.
+    """
+    def decorator(func):
+        @functools.lru_cache(maxsize=maxsize)
+        @functools.wraps(func)
+        def wrapper(*args):
+            return _to_plain_json(func(*args))
+        return wrapper
+    return decorator
+
+
+@_prerendered(maxsize=1)
 def login_layout():
     """Login page layout."""
     return dbc.Container([
@@ -574,6 +625,7 @@ def login_layout():
     ])
 
 
+@_prerendered(maxsize=1)
 def register_layout():
     """Registration page layout."""
     return dbc.Container([
@@ -622,8 +674,14 @@ def register_layout():
 
 def dashboard_layout(user):
     """Main dashboard showing task list with AG Grid and status overview."""
+    return _dashboard_layout(*_user_key(user))
+
+
+@_prerendered(maxsize=64)
+def _dashboard_layout(user_name, is_admin):
+    """Build the dashboard; only the navbar varies between users."""
     return dbc.Container([
-        navbar(user),
+        _navbar(user_name, is_admin),
         dbc.Row([
             dbc.Col(html.H2("Analysis Tasks"), width="auto"),
             dbc.Col(
@@ -640,12 +698,20 @@ def dashboard_layout(user):
             ),
         ], className="align-items-center mb-3"),
         html.Hr(className="mt-0"),
-        _make_ag_grid(
+        _static_grid(
             table_id="task-list-table",
             column_defs=TASK_LIST_COLUMNS,
-            row_model="clientSide",
+            row_model="infinite",
             height="700px",
-            style_conditions=TASK_STATUS_ROW_STYLES,
+            row_class="taskRowClass",
+            row_id="id",
+            # Larger blocks mean fewer getRowsRequest round trips while
+            # scrolling; at most 4 blocks (400 rows) stay in the browser
+            grid_options_extra={
+                "cacheBlockSize": 100,
+                "maxBlocksInCache": 4,
+                "infiniteInitialRowCount": 50,
+            },
         ),
         # Account management section
         html.Hr(),
@@ -681,14 +747,24 @@ def dashboard_layout(user):
         ]),
         # Stores & intervals
         dcc.Store(id="task-list-store"),
+        dcc.Store(id="task-list-refreshed"),
+        dcc.Store(id="task-list-version"),
+        dcc.Store(id="task-list-changed"),
         dcc.Interval(id="refresh-interval", interval=30000, n_intervals=0),
+        dcc.Store(id="refresh-tick"),
     ])
 
 
 def submit_layout(user):
     """Task submission form with file upload and covariate selection."""
+    return _submit_layout(*_user_key(user))
+
+
+@_prerendered(maxsize=64)
+def _submit_layout(user_name, is_admin):
+    """Build the submit form; only the navbar varies between users."""
     return dbc.Container([
-        navbar(user),
+        _navbar(user_name, is_admin),
         html.H2("Submit Analysis Task"),
         html.Hr(),
         dbc.Form([
@@ -827,12 +903,14 @@ def submit_layout(user):
                         ], className="py-2 px-3"),
                     ], className="mb-2"),
 
-                    dbc.Checklist(
+                    # A multi-select dropdown only renders the chosen values
+                    # and the visible menu options, not one node per covariate
+                    dcc.Dropdown(
                         id="covariate-selection",
-                        options=[{"label": c, "value": c}
-                                 for c in ALL_COVARIATES],
+                        options=COVARIATE_OPTIONS,
                         value=DEFAULT_COVARIATES,
-                        inline=False,
+                        multi=True,
+                        optionHeight=28,
                         className="ms-2",
                     ),
                 ], width=6),
@@ -894,46 +972,47 @@ def task_detail_layout(user, task_id):
         ], id="detail-tabs", active_tab="tab-overview"),
 
         dcc.Store(id="task-id-store", data=task_id),
+        # Version of the task the tabs were last rendered for
+        dcc.Store(id="task-detail-version"),
+        dcc.Store(id="task-overview-key"),
+        dcc.Store(id="task-results-key"),
+        dcc.Store(id="task-plots-key"),
+        dcc.Store(id="task-map-key"),
         dcc.Interval(id="detail-refresh-interval", interval=15000,
                      n_intervals=0),
+        dcc.Store(id="detail-refresh-tick"),
     ])
 
 
-def _build_category_options():
-    """Build dropdown options with variable names per category from config."""
-    gee_config_path = os.path.join(
-        os.path.dirname(__file__), "gee-export", "config.py"
-    )
-    spec = importlib.util.spec_from_file_location("gee_export_config", gee_config_path)
-    gee_config = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(gee_config)
-    covariates = gee_config.COVARIATES
+def _labeled_select(label, select_id, options, *, value=None, width=4,
+                    size=None, placeholder=None):
+    """Column holding a label above a select dropdown."""
+    return dbc.Col([
+        dbc.Label(label, size=size),
+        dbc.Select(id=select_id, options=list(options), value=value,
+                   placeholder=placeholder),
+    ], width=width)
+
 
+@functools.lru_cache(maxsize=1)
+def _category_options(gee_config):
+    """Category dropdown options for one loaded ``gee-export`` config module.
+
+    Keyed on the module object, which ``load_gee_config`` only replaces
+    when the config file changes, so admin page renders reuse the list.
+    """
     # Group variable names by category
     cats = {}
-    for name, cfg in covariates.items():
+    for name, cfg in gee_config.COVARIATES.items():
         cat = cfg.get("category", "other")
         cats.setdefault(cat, []).append(name)
 
-    # Pretty labels for categories
-    cat_labels = {
-        "climate": "Climate",
-        "terrain": "Terrain",
-        "accessibility": "Accessibility",
-        "demographics": "Demographics",
-        "biomass": "Biomass",
-        "land_cover": "Land Cover",
-        "forest_cover": "Forest Cover",
-        "ecological": "Ecological",
-        "administrative": "Administrative",
-    }
-
     # Build "All" option with total count
     total = sum(len(v) for v in cats.values())
     options = [{"label": f"All ({total} layers)", "value": "all"}]
 
     # Build per-category options in display order
-    for cat_key, cat_label in cat_labels.items():
+    for cat_key, cat_label in CATEGORY_LABELS.items():
         names = cats.get(cat_key, [])
         if not names:
             continue
@@ -952,10 +1031,20 @@ def _build_category_options():
 
 def admin_layout(user):
     """Admin panel for covariate management and users."""
-    category_options = _build_category_options()
+    return _admin_layout(*_user_key(user), load_gee_config())
+
+
+@_prerendered(maxsize=16)
+def _admin_layout(user_name, is_admin, gee_config):
+    """Build the admin panel for one navbar variant and GEE config.
+
+    Keyed on the loaded config module too, so the category dropdown is
+    rebuilt when ``gee-export/config.py`` changes.
+    """
+    category_options = _category_options(gee_config)
 
     return dbc.Container([
-        navbar(user),
+        _navbar(user_name, is_admin),
         html.H2("Admin Panel"),
         html.Hr(),
 
@@ -966,14 +1055,9 @@ def admin_layout(user):
                     dbc.CardHeader("Export Covariate Layers from GEE"),
                     dbc.CardBody([
                         dbc.Row([
-                            dbc.Col([
-                                dbc.Label("Category"),
-                                dbc.Select(
-                                    id="gee-export-category",
-                                    options=category_options,
-                                    value="all",
-                                ),
-                            ], width=6),
+                            _labeled_select("Category", "gee-export-category",
+                                            category_options, value="all",
+                                            width=6),
                             dbc.Col([
                                 html.Div(style={"height": "32px"}),
                                 dbc.Button("Start Export",
@@ -998,123 +1082,125 @@ def admin_layout(user):
                         className="text-end",
                     ),
                 ], className="align-items-center mb-2"),
-                _make_ag_grid(
+                _static_grid(
                     table_id="covariates-table",
                     column_defs=COVARIATE_COLUMNS,
                     row_model="clientSide",
                     height="500px",
-                    style_conditions=COVARIATE_STATUS_ROW_STYLES,
+                    row_class="covariateRowClass",
+                    row_id="covariate_name",
                     grid_options_extra={
                         "rowSelection": "multiple",
                         "suppressRowClickSelection": True,
                         "isRowSelectable": {
-                            "function": (
-                                "!!params.data"
-                                " && params.data.gcs_tiles > 0"
-                                " && params.data.status !== 'merging'"
-                                " && params.data.status !== 'pending_merge'"
-                                " && params.data.status !== 'exporting'"
-                                " && params.data.status !== 'pending_export'"
-                            )
+                            "function": "covariateRowSelectable(params)",
                         },
                     },
                 ),
                 html.Div(id="covariate-action-result", className="mt-2"),
             ]),
-            dbc.Tab(label="Users", tab_id="tab-users", children=[
-                dbc.Row([
-                    dbc.Col(html.H5("User Management", className="mt-3"),
-                            width="auto"),
-                    dbc.Col(
-                        html.Span(id="user-management-total-count",
-                                  children="Total: 0",
-                                  className="text-muted fw-bold mt-3"),
-                        width=True,
-                        className="text-end",
-                    ),
-                ], className="align-items-center mb-2"),
-
-                # User action controls
-                dbc.Card([
-                    dbc.CardHeader("User Actions"),
-                    dbc.CardBody([
-                        html.P(
-                            "Select a user from the table below, then use "
-                            "these actions.",
-                            className="text-muted small mb-3",
-                        ),
-                        dbc.Row([
-                            dbc.Col([
-                                dbc.Label("Selected User", size="sm"),
-                                dbc.Select(
-                                    id="admin-user-select",
-                                    options=[],
-                                    placeholder="Select a user...",
-                                ),
-                            ], width=4),
-                            dbc.Col([
-                                dbc.Label("Change Role", size="sm"),
-                                dbc.Select(
-                                    id="admin-role-select",
-                                    options=[
-                                        {"label": "User", "value": "user"},
-                                        {"label": "Admin", "value": "admin"},
-                                    ],
-                                    value="user",
-                                ),
-                            ], width=2),
-                            dbc.Col([
-                                html.Div(style={"height": "32px"}),
-                                dbc.ButtonGroup([
-                                    dbc.Button("Approve",
-                                               id="admin-approve-btn",
-                                               color="success", size="sm"),
-                                    dbc.Button("Change Role",
-                                               id="admin-role-btn",
-                                               color="info", size="sm"),
-                                    dbc.Button("Delete",
-                                               id="admin-delete-btn",
-                                               color="danger", size="sm"),
-                                ]),
-                            ], width="auto",
-                               className="d-flex align-items-end"),
-                        ]),
-                        html.Div(id="admin-user-action-result",
-                                 className="mt-2"),
-                        # Confirmation modal for admin delete
-                        dbc.Modal([
-                            dbc.ModalHeader(
-                                dbc.ModalTitle("Confirm Delete User")),
-                            dbc.ModalBody(
-                                "Are you sure you want to delete this user "
-                                "and all their analysis tasks? This cannot be "
-                                "undone."
-                            ),
-                            dbc.ModalFooter([
-                                dbc.Button("Cancel",
-                                           id="admin-delete-cancel",
-                                           color="secondary",
-                                           className="me-2"),
-                                dbc.Button("Delete User",
-                                           id="admin-delete-confirm",
-                                           color="danger"),
-                            ]),
-                        ], id="admin-delete-modal", is_open=False,
-                           centered=True),
-                    ]),
-                ], className="mt-3 mb-3"),
-
-                _make_ag_grid(
-                    table_id="user-management-table",
-                    column_defs=USER_MANAGEMENT_COLUMNS,
-                    row_model="clientSide",
-                    height="500px",
-                ),
-            ]),
+            # Built on first open by a callback (see admin_users_tab)
+            dbc.Tab(label="Users", tab_id="tab-users",
+                    children=html.Div(id="tab-users-content")),
         ], id="admin-tabs", active_tab="tab-covariates"),
 
         dcc.Interval(id="admin-refresh-interval", interval=30000,
                      n_intervals=0),
+        dcc.Store(id="admin-refresh-tick"),
+        dcc.Store(id="tab-users-built", data=False),
+    ])
+
+
+@_prerendered(maxsize=1)
+def admin_users_tab():
+    """Contents of the admin "Users" tab.
+
+    Mounted by a callback the first time the tab is opened, so admin
+    page loads that stay on the covariates tab never build or ship the
+    user grid and its controls.
+    """
+    return html.Div([
+        dbc.Row([
+            dbc.Col(html.H5("User Management", className="mt-3"),
+                    width="auto"),
+            dbc.Col(
+                html.Span(id="user-management-total-count",
+                          children="Total: 0",
+                          className="text-muted fw-bold mt-3"),
+                width=True,
+                className="text-end",
+            ),
+        ], className="align-items-center mb-2"),
+
+        # User action controls
+        dbc.Card([
+            dbc.CardHeader("User Actions"),
+            dbc.CardBody([
+                html.P(
+                    "Select a user from the table below, then use "
+                    "these actions.",
+                    className="text-muted small mb-3",
+                ),
+                dbc.Row([
+                    _labeled_select("Selected User", "admin-user-select", (),
+                                    size="sm",
+                                    placeholder="Select a user..."),
+                    _labeled_select("Change Role", "admin-role-select",
+                                    ROLE_OPTIONS, value="user", width=2,
+                                    size="sm"),
+                    dbc.Col([
+                        html.Div(style={"height": "32px"}),
+                        dbc.ButtonGroup([
+                            dbc.Button("Approve",
+                                       id="admin-approve-btn",
+                                       color="success", size="sm"),
+                            dbc.Button("Change Role",
+                                       id="admin-role-btn",
+                                       color="info", size="sm"),
+                            dbc.Button("Delete",
+                                       id="admin-delete-btn",
+                                       color="danger", size="sm"),
+                        ]),
+                    ], width="auto",
+                       className="d-flex align-items-end"),
+                ]),
+                html.Div(id="admin-user-action-result",
+                         className="mt-2"),
+                # Confirmation modal for admin delete
+                dbc.Modal([
+                    dbc.ModalHeader(
+                        dbc.ModalTitle("Confirm Delete User")),
+                    dbc.ModalBody(
+                        "Are you sure you want to delete this user "
+                        "and all their analysis tasks? This cannot be "
+                        "undone."
+                    ),
+                    dbc.ModalFooter([
+                        dbc.Button("Cancel",
+                                   id="admin-delete-cancel",
+                                   color="secondary",
+                                   className="me-2"),
+                        dbc.Button("Delete User",
+                                   id="admin-delete-confirm",
+                                   color="danger"),
+                    ]),
+                ], id="admin-delete-modal", is_open=False,
+                   centered=True),
+            ]),
+        ], className="mt-3 mb-3"),
+
+        _static_grid(
+            table_id="user-management-table",
+            column_defs=USER_MANAGEMENT_COLUMNS,
+            row_model="infinite",
+            height="500px",
+            row_id="id",
+            grid_options_extra={
+                "cacheBlockSize": 100,
+                "maxBlocksInCache": 10,
+            },
+        ),
+        dcc.Store(id="user-management-refreshed"),
     ])
 
 
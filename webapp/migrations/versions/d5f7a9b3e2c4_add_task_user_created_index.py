@@ -0,0 +1,30 @@
+"""add composite (submitted_by, created_at) index on analysis_tasks
+
+Revision ID: d5f7a9b3e2c4
+Revises: c4e6f8a2d1b3
+Create Date: 2026-10-15 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5f7a9b3e2c4"
+down_revision: Union[str, None] = "c4e6f8a2d1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Serves the paginated per-user dashboard task list
+    op.create_index(
+        "idx_tasks_user_created",
+        "analysis_tasks",
+        ["submitted_by", "created_at"],
+        postgresql_ops={"created_at": "DESC"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_tasks_user_created", table_name="analysis_tasks")
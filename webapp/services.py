@@ -5,6 +5,8 @@ uploading site files, and managing GEE covariate exports. Used by the
 Dash callbacks to keep business logic out of the UI layer.
 """
 
+import functools
+import importlib.util
 import io
 import json
 import logging
@@ -15,6 +17,7 @@ from datetime import datetime, timezone
 
 import boto3
 import geopandas as gpd
+import orjson
 import pandas as pd
 
 from config import Config
@@ -25,6 +28,7 @@ from models import (
     TaskResult,
     TaskResultTotal,
     TaskSite,
+    User,
     get_db,
 )
 
@@ -45,7 +49,47 @@ def _get_batch_module():
     return _batch_module
 
 
+# GEE export covariate definitions live in a sibling (non-package) directory
+GEE_CONFIG_PATH = os.path.join(
+    os.path.dirname(__file__), "gee-export", "config.py"
+)
+
+# Pretty labels for covariate categories
+CATEGORY_LABELS = {
+    "climate": "Climate",
+    "terrain": "Terrain",
+    "accessibility": "Accessibility",
+    "demographics": "Demographics",
+    "biomass": "Biomass",
+    "land_cover": "Land Cover",
+    "forest_cover": "Forest Cover",
+    "ecological": "Ecological",
+    "administrative": "Administrative",
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _exec_gee_config(mtime):
+    spec = importlib.util.spec_from_file_location(
+        "gee_export_config", GEE_CONFIG_PATH
+    )
+    gee_config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(gee_config)
+    return gee_config
+
+
+def load_gee_config():
+    """Return the ``gee-export/config.py`` module.
+
+    The module is executed once and cached; it is only re-executed when
+    the file's modification time changes.
+    """
+    return _exec_gee_config(os.path.getmtime(GEE_CONFIG_PATH))
+
+
+@functools.lru_cache(maxsize=1)
 def get_s3_client():
+    """Return the shared (thread-safe) boto3 S3 client."""
     return boto3.client("s3", region_name=Config.AWS_REGION)
 
 
@@ -106,6 +150,67 @@ def parse_sites_file(file_content, filename):
     return gdf, errors
 
 
+# Parsed uploads are kept in Redis between upload and submit; long
+# enough to fill in the form, short enough that abandoned uploads of
+# several MB do not pile up
+UPLOAD_CACHE_TTL = 1800
+
+_redis_client = None
+
+
+def _get_redis():
+    global _redis_client
+    if _redis_client is None:
+        import redis
+        _redis_client = redis.Redis.from_url(Config.REDIS_URL)
+    return _redis_client
+
+
+def _upload_cache_key(upload_id, user_id):
+    return f"upload:{user_id}:{upload_id}"
+
+
+def cache_uploaded_sites(gdf, user_id):
+    """Cache a parsed site GeoDataFrame in Redis until the task is submitted.
+
+    Attributes are stored column-wise and geometries as hex WKB, encoded
+    with ``orjson``.  Returns the upload id to hand to the browser; the
+    entry is scoped to *user_id* and expires after ``UPLOAD_CACHE_TTL``.
+    """
+    props = pd.DataFrame(gdf.drop(columns=gdf.geometry.name))
+    props = props.astype(object).where(props.notna(), None)
+    payload = orjson.dumps({
+        "columns": props.to_dict(orient="list"),
+        "geometry_wkb": gdf.geometry.to_wkb(hex=True).tolist(),
+        "crs": gdf.crs.to_string() if gdf.crs else None,
+    }, default=str)
+
+    upload_id = uuid.uuid4().hex
+    _get_redis().setex(
+        _upload_cache_key(upload_id, user_id), UPLOAD_CACHE_TTL, payload,
+    )
+    return upload_id
+
+
+def load_uploaded_sites(upload_id, user_id):
+    """Return the GeoDataFrame cached by :func:`cache_uploaded_sites`.
+
+    Returns None if the upload id is unknown, belongs to another user, or
+    has expired.
+    """
+    if not upload_id:
+        return None
+    payload = _get_redis().get(_upload_cache_key(upload_id, user_id))
+    if payload is None:
+        return None
+    data = orjson.loads(payload)
+    return gpd.GeoDataFrame(
+        pd.DataFrame(data["columns"]),
+        geometry=gpd.GeoSeries.from_wkb(data["geometry_wkb"]),
+        crs=data["crs"],
+    )
+
+
 def upload_sites_to_s3(gdf, task_id):
     """Upload a GeoDataFrame as GeoJSON to S3.
 
@@ -238,8 +343,9 @@ def _submit_via_api(task_name, description, user_id, gdf,
             ),
         }
 
-        # Submit via trends.earth API — prefer user's stored OAuth2 creds
-        user_creds = get_decrypted_secret(user_id)
+        # Submit via trends.earth API — prefer user's stored OAuth2 creds,
+        # read on the session this submission already holds
+        user_creds = get_decrypted_secret(user_id, db=db)
         if user_creds:
             client_id, client_secret = user_creds
             client = TrendsEarthClient.from_oauth2_credentials(
@@ -376,16 +482,243 @@ def _submit_via_batch(task_name, description, user_id, gdf,
         db.close()
 
 
-def get_task_list(user_id=None, limit=50):
-    """Get recent analysis tasks, optionally filtered by user."""
+def _grid_filter_clause(column, spec):
+    """Translate one AG Grid column filter model into a SQL clause."""
+    from sqlalchemy import String, and_, cast, func, or_
+
+    if "conditions" in spec:
+        clauses = [_grid_filter_clause(column, c) for c in spec["conditions"]]
+        combine = or_ if spec.get("operator") == "OR" else and_
+        return combine(*clauses)
+
+    ftype = spec.get("type", "contains")
+    value = spec.get("filter")
+    if ftype == "blank":
+        return column.is_(None)
+    if ftype == "notBlank":
+        return column.isnot(None)
+
+    if spec.get("filterType") == "number":
+        ops = {
+            "equals": column == value,
+            "notEqual": column != value,
+            "lessThan": column < value,
+            "lessThanOrEqual": column <= value,
+            "greaterThan": column > value,
+            "greaterThanOrEqual": column >= value,
+            "inRange": column.between(value, spec.get("filterTo")),
+        }
+        return ops.get(ftype, column == value)
+
+    text = cast(column, String)
+    value = str(value or "")
+    if ftype == "equals":
+        return func.lower(text) == value.lower()
+    if ftype == "notEqual":
+        return func.lower(text) != value.lower()
+    if ftype == "startsWith":
+        return text.istartswith(value, autoescape=True)
+    if ftype == "endsWith":
+        return text.iendswith(value, autoescape=True)
+    if ftype == "notContains":
+        return ~text.icontains(value, autoescape=True)
+    return text.icontains(value, autoescape=True)
+
+
+# Dashboard grid column id -> AnalysisTask column, for sorting/filtering
+_TASK_GRID_COLUMNS = {
+    "name": AnalysisTask.name,
+    "status": AnalysisTask.status,
+    "n_sites": AnalysisTask.n_sites,
+    "created_at": AnalysisTask.created_at,
+    "submitted_at": AnalysisTask.submitted_at,
+    "completed_at": AnalysisTask.completed_at,
+}
+
+
+def _grid_select(id_column, columns, datetimes=(), fills=None):
+    """Select list that returns grid rows as display-ready values.
+
+    PostgreSQL casts the id to text, formats *datetimes* with ``to_char``
+    (UTC, ``'-'`` when null) and applies the null *fills*, so rows can be
+    sent to the grid without per-row conversion in Python.  Sorting and
+    filtering still use the raw columns.
+    """
+    from sqlalchemy import String, cast, func
+
+    fills = fills or {}
+    select = [cast(id_column, String).label("id")]
+    for col_id, column in columns.items():
+        if col_id in datetimes:
+            column = func.coalesce(
+                func.to_char(func.timezone("UTC", column),
+                             "YYYY-MM-DD HH24:MI"),
+                "-",
+            )
+        elif col_id in fills:
+            column = func.coalesce(column, fills[col_id])
+        select.append(column.label(col_id))
+    return select
+
+
+def _grid_page(query, columns, start_row, end_row, sort_model,
+               filter_model, default_order):
+    """Apply an AG Grid infinite-model request to *query*.
+
+    Parameters
+    ----------
+    query : sqlalchemy.orm.Query
+        Base query selecting the grid's row tuples.
+    columns : dict[str, Column]
+        Grid column id to the SQL column it sorts and filters on; ids
+        outside this map are ignored.
+    start_row, end_row : int
+        Row window requested by the grid (``end_row`` is exclusive).
+    sort_model : list[dict] or None
+        AG Grid sort model (``[{"colId": ..., "sort": "asc"|"desc"}]``).
+    filter_model : dict or None
+        AG Grid filter model keyed by column id.
+    default_order : list
+        Order-by clauses applied after the grid's sort; must end with a
+        unique key so pages are stable.
+
+    Returns
+    -------
+    tuple[list[Row], int]
+        The rows in the window and the total number of matching rows.
+    """
+    for col_id, spec in (filter_model or {}).items():
+        column = columns.get(col_id)
+        if column is not None:
+            query = query.filter(_grid_filter_clause(column, spec))
+
+    total = query.count()
+
+    order = []
+    for item in sort_model or []:
+        column = columns.get(item.get("colId"))
+        if column is not None:
+            order.append(
+                column.asc() if item.get("sort") == "asc" else column.desc()
+            )
+    order.extend(default_order)
+
+    rows = (
+        query.order_by(*order)
+        .offset(start_row)
+        .limit(max(end_row - start_row, 0))
+        .all()
+    )
+    return rows, total
+
+
+def get_task_page(user_id=None, start_row=0, end_row=50, sort_model=None,
+                  filter_model=None):
+    """Fetch one block of the dashboard task list for AG Grid's infinite model.
+
+    Only the grid's columns are selected, already formatted for display,
+    so rows come back as plain tuples rather than fully hydrated
+    ``AnalysisTask`` objects.
+
+    Parameters
+    ----------
+    user_id : UUID or None
+        Only return tasks submitted by this user; ``None`` returns all.
+    start_row, end_row : int
+        Row window requested by the grid (``end_row`` is exclusive).
+    sort_model : list[dict] or None
+        AG Grid sort model (``[{"colId": ..., "sort": "asc"|"desc"}]``).
+    filter_model : dict or None
+        AG Grid filter model keyed by column id.
+
+    Returns
+    -------
+    tuple[list[Row], int]
+        The rows in the window (``id`` followed by the fields of
+        ``_TASK_GRID_COLUMNS``) and the total number of matching tasks.
+    """
     db = get_db()
     try:
-        query = db.query(AnalysisTask).order_by(
-            AnalysisTask.created_at.desc()
+        query = db.query(*_grid_select(
+            AnalysisTask.id, _TASK_GRID_COLUMNS,
+            datetimes=("created_at", "submitted_at", "completed_at"),
+            fills={"n_sites": 0},
+        ))
+        if user_id:
+            query = query.filter(AnalysisTask.submitted_by == user_id)
+        # Newest first, with the primary key as a stable paging tiebreaker
+        return _grid_page(
+            query, _TASK_GRID_COLUMNS, start_row, end_row, sort_model,
+            filter_model, [AnalysisTask.created_at.desc(), AnalysisTask.id],
+        )
+    finally:
+        db.close()
+
+
+def get_task(task_id):
+    """Get a single analysis task row, without its sites or results."""
+    db = get_db()
+    try:
+        return db.query(AnalysisTask).filter(
+            AnalysisTask.id == task_id
+        ).first()
+    finally:
+        db.close()
+
+
+def get_task_status(task_id):
+    """Get a task row plus its result row counts, without loading results.
+
+    Used by the task detail page to decide whether anything changed since
+    the last refresh.
+    """
+    from sqlalchemy import func
+
+    db = get_db()
+    try:
+        task = db.query(AnalysisTask).filter(
+            AnalysisTask.id == task_id
+        ).first()
+        if not task:
+            return None
+
+        n_results = db.query(func.count(TaskResult.id)).filter(
+            TaskResult.task_id == task_id
+        ).scalar()
+        n_totals = db.query(func.count(TaskResultTotal.id)).filter(
+            TaskResultTotal.task_id == task_id
+        ).scalar()
+
+        return {"task": task, "n_results": n_results, "n_totals": n_totals}
+    finally:
+        db.close()
+
+
+def get_task_list_version(user_id=None):
+    """Fingerprint of the dashboard task list, for change detection.
+
+    Aggregates the task count and latest lifecycle timestamp per status,
+    so any submission, deletion or status transition changes the result
+    without reading the task rows themselves.
+    """
+    from sqlalchemy import func
+
+    latest = func.max(func.greatest(
+        AnalysisTask.created_at, AnalysisTask.submitted_at,
+        AnalysisTask.started_at, AnalysisTask.completed_at,
+    ))
+    db = get_db()
+    try:
+        query = db.query(
+            AnalysisTask.status, func.count(AnalysisTask.id), latest,
         )
         if user_id:
             query = query.filter(AnalysisTask.submitted_by == user_id)
-        return query.limit(limit).all()
+        rows = (
+            query.group_by(AnalysisTask.status)
+            .order_by(AnalysisTask.status)
+        )
+        return ";".join(f"{status}|{n}|{ts}" for status, n, ts in rows)
     finally:
         db.close()
 
@@ -429,20 +762,15 @@ def start_gee_export(covariate_names, user_id):
     of export record IDs.
     """
     import ee
-    import importlib.util
     import sys
 
-    gee_dir = os.path.join(os.path.dirname(__file__), "gee-export")
+    gee_dir = os.path.dirname(GEE_CONFIG_PATH)
 
     # Load gee-export/config.py as its own module, then temporarily
     # inject it into sys.modules["config"] so that gee-export/tasks.py
     # (which does "from config import COVARIATES") picks it up instead
     # of the webapp's config.py.
-    gee_cfg_spec = importlib.util.spec_from_file_location(
-        "gee_export_config", os.path.join(gee_dir, "config.py")
-    )
-    gee_cfg = importlib.util.module_from_spec(gee_cfg_spec)
-    gee_cfg_spec.loader.exec_module(gee_cfg)
+    gee_cfg = load_gee_config()
 
     original_config = sys.modules.get("config")
     sys.modules["config"] = gee_cfg
@@ -524,37 +852,124 @@ def list_export_tiles(bucket, prefix, covariate_name):
     prefix.  Returns a list of public ``https://storage.googleapis.com/…``
     URLs, or an empty list if listing fails.
     """
+    tiles = list_export_tiles_batch(bucket, prefix, [covariate_name])
+    return tiles.get(covariate_name, [])
+
+
+def list_export_tiles_batch(bucket, prefix, covariate_names):
+    """List exported tile URLs from GCS for several covariates at once.
+
+    Makes one paginated listing over the longest prefix shared by all the
+    covariates' export prefixes and splits the results in-process, rather
+    than one list call per covariate.
+
+    Parameters
+    ----------
+    bucket : str
+        GCS bucket name (public, no credentials needed).
+    prefix : str
+        Export prefix the covariates were written under.
+    covariate_names : list[str]
+        Covariates to collect tiles for.
+
+    Returns
+    -------
+    dict[str, list[str]]
+        Mapping of covariate name to its sorted public tile URLs.  All
+        lists are empty if listing fails.
+    """
     import requests
 
-    obj_prefix = f"{prefix}/{covariate_name}".strip("/")
+    obj_prefixes = {
+        name: f"{prefix}/{name}".strip("/") for name in covariate_names
+    }
+    tiles = {name: [] for name in covariate_names}
+    if not obj_prefixes:
+        return tiles
+
+    common = os.path.commonprefix(list(obj_prefixes.values()))
     api_url = (
         f"https://storage.googleapis.com/storage/v1/b/{bucket}/o"
-        f"?prefix={obj_prefix}&maxResults=1000"
+        f"?prefix={common}&maxResults=1000"
     )
     try:
-        resp = requests.get(api_url, timeout=15)
-        resp.raise_for_status()
-        items = resp.json().get("items", [])
-        urls = [
-            f"https://storage.googleapis.com/{bucket}/{item['name']}"
-            for item in items
-            if item["name"].endswith(".tif")
-        ]
-        return sorted(urls)
+        names = []
+        page_token = None
+        while True:
+            url = api_url
+            if page_token:
+                url += f"&pageToken={page_token}"
+            resp = requests.get(url, timeout=15)
+            resp.raise_for_status()
+            data = resp.json()
+            names.extend(
+                item["name"] for item in data.get("items", [])
+                if item["name"].endswith(".tif")
+            )
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                break
     except Exception as exc:
         logger.warning(
             "Failed to list GCS tiles for %s/%s: %s",
-            bucket, covariate_name, exc,
+            bucket, ", ".join(covariate_names), exc,
         )
-        return []
+        return tiles
+
+    for name, obj_prefix in obj_prefixes.items():
+        tiles[name] = sorted(
+            f"https://storage.googleapis.com/{bucket}/{n}"
+            for n in names if n.startswith(obj_prefix)
+        )
+    return tiles
+
+
+# Admin user grid column id -> SQL column it sorts/filters on
+_USER_GRID_COLUMNS = {
+    "name": User.name,
+    "email": User.email,
+    "role": User.role,
+    "is_approved": User.is_approved,
+    "created_at": User.created_at,
+    "last_login": User.last_login,
+    "is_active": User.is_active,
+}
+
+
+def get_user_page(start_row=0, end_row=100, sort_model=None,
+                  filter_model=None):
+    """Fetch one block of the admin user grid for AG Grid's infinite model.
+
+    Takes the same window, sort and filter arguments as ``get_task_page``
+    and returns ``(rows, total)``; each row holds ``id`` followed by the
+    fields of ``_USER_GRID_COLUMNS``.
+    """
+    db = get_db()
+    try:
+        query = db.query(*_grid_select(
+            User.id, _USER_GRID_COLUMNS,
+            datetimes=("created_at", "last_login"),
+        ))
+        return _grid_page(
+            query, _USER_GRID_COLUMNS, start_row, end_row, sort_model,
+            filter_model, [User.created_at.desc(), User.id],
+        )
+    finally:
+        db.close()
 
 
 def get_user_list():
-    """Return all users ordered by creation date (admin only)."""
+    """Return ``(id, name, email, is_approved)`` for all users, newest first.
+
+    Only the columns the admin user picker shows are selected.
+    """
     db = get_db()
     try:
-        from models import User
-        return db.query(User).order_by(User.created_at.desc()).all()
+        return (
+            db.query(User.id, User.name, User.email, User.is_approved)
+            .order_by(User.created_at.desc())
+            .all()
+        )
     finally:
         db.close()
 
@@ -626,22 +1041,26 @@ def delete_user(user_id):
         db.close()
 
 
-def download_results_csv(task_id, result_type="by_site_year"):
-    """Download result CSV from S3 for a completed task.
+# Result CSV filenames written by the summarize step, by result type
+RESULT_CSV_FILES = {
+    "by_site_year": "results_by_site_year.csv",
+    "by_site_total": "results_by_site_total.csv",
+    "pixel_level": "results_pixel_level.csv",
+}
+
+
+def open_results_csv(task_id, result_type="by_site_year"):
+    """Open a result CSV on S3 for a completed task without reading it.
 
     Args:
         task_id: The task UUID.
         result_type: One of 'by_site_year', 'by_site_total', 'pixel_level'.
 
     Returns:
-        CSV content as string, or None if not found.
+        ``(filename, body)`` where *body* is the boto3 ``StreamingBody``
+        (read it in chunks with ``iter_chunks``), or None if not found.
     """
-    filename_map = {
-        "by_site_year": "results_by_site_year.csv",
-        "by_site_total": "results_by_site_total.csv",
-        "pixel_level": "results_pixel_level.csv",
-    }
-    filename = filename_map.get(result_type)
+    filename = RESULT_CSV_FILES.get(result_type)
     if not filename:
         return None
 
@@ -649,7 +1068,7 @@ def download_results_csv(task_id, result_type="by_site_year"):
     key = f"{Config.S3_PREFIX}/tasks/{task_id}/output/{filename}"
     try:
         response = s3.get_object(Bucket=Config.S3_BUCKET, Key=key)
-        return response["Body"].read().decode("utf-8")
+        return filename, response["Body"]
     except s3.exceptions.NoSuchKey:
         return None
 
@@ -808,32 +1227,10 @@ def get_covariate_inventory():
         gcs_tiles, on_s3, s3_url, status, gee_task_id, size_mb,
         merged_url, started_at, completed_at, error_message.
     """
-    import importlib.util
-
     from cog_merge import list_all_gcs_tiles, list_s3_cog_objects
 
     # Load covariate definitions from GEE export config
-    gee_config_path = os.path.join(
-        os.path.dirname(__file__), "gee-export", "config.py"
-    )
-    spec = importlib.util.spec_from_file_location(
-        "gee_export_config", gee_config_path
-    )
-    gee_config = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(gee_config)
-    covariates = gee_config.COVARIATES
-
-    cat_labels = {
-        "climate": "Climate",
-        "terrain": "Terrain",
-        "accessibility": "Accessibility",
-        "demographics": "Demographics",
-        "biomass": "Biomass",
-        "land_cover": "Land Cover",
-        "forest_cover": "Forest Cover",
-        "ecological": "Ecological",
-        "administrative": "Administrative",
-    }
+    covariates = load_gee_config().COVARIATES
 
     # 1. Scan GCS for tiles (single paginated API call)
     gcs_counts: dict[str, int] = {}
@@ -889,7 +1286,7 @@ def get_covariate_inventory():
 
         row = {
             "covariate_name": name,
-            "category": cat_labels.get(raw_cat, raw_cat),
+            "category": CATEGORY_LABELS.get(raw_cat, raw_cat),
             "description": cfg.get("description", ""),
             "gcs_tiles": gcs_tiles,
             "on_s3": bool(s3_obj),
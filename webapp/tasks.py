@@ -7,6 +7,8 @@ Celery worker process.  The web application dispatches work by calling
 
 import logging
 
+from celery.exceptions import SoftTimeLimitExceeded
+
 from celery_app import celery_app
 from config import report_exception
 
@@ -32,7 +34,22 @@ def import_vector_data_task(self) -> dict:
         raise self.retry(exc=exc, countdown=60)
 
 
-@celery_app.task(name="tasks.run_cog_merge", bind=True, max_retries=1)
+# Limits on one merge, both below the broker's 6 h visibility timeout
+# (celery_app.py).  The soft limit raises SoftTimeLimitExceeded inside the
+# merge, which is recorded as a failure; the hard limit only fires if the
+# merge does not unwind within the grace period after that.
+COG_MERGE_SOFT_TIME_LIMIT = 5 * 3600
+COG_MERGE_TIME_LIMIT = COG_MERGE_SOFT_TIME_LIMIT + 300
+
+
+# A merge killed by the hard limit (or a lost worker) is not acknowledged,
+# so the broker re-delivers it once.  The re-delivered message is not
+# merged again: it marks the covariate failed so it is not left stuck in
+# 'merging', and an admin can start a new merge.
+@celery_app.task(name="tasks.run_cog_merge", bind=True, max_retries=1,
+                 soft_time_limit=COG_MERGE_SOFT_TIME_LIMIT,
+                 time_limit=COG_MERGE_TIME_LIMIT,
+                 acks_on_failure_or_timeout=False)
 def run_cog_merge(self, layer_id: str) -> dict:
     """Merge GCS tiles into a single COG and upload to S3.
 
@@ -60,6 +77,16 @@ def run_cog_merge(self, layer_id: str) -> dict:
             logger.error("Covariate %s not found", layer_id)
             return {"status": "failed", "error": "record not found"}
 
+        if (self.request.delivery_info or {}).get("redelivered"):
+            error = "merge was interrupted (time limit or worker lost)"
+            logger.error("COG merge for layer %s %s; not retrying",
+                         layer_id, error)
+            layer.status = "failed"
+            layer.error_message = error
+            layer.completed_at = datetime.now(timezone.utc)
+            db.commit()
+            return {"status": "failed", "error": error}
+
         # Transition to 'merging'
         layer.status = "merging"
         db.commit()
@@ -87,18 +114,24 @@ def run_cog_merge(self, layer_id: str) -> dict:
         }
 
     except Exception as exc:
+        if isinstance(exc, SoftTimeLimitExceeded):
+            hours = COG_MERGE_SOFT_TIME_LIMIT // 3600
+            error = f"merge exceeded the {hours} h time limit"
+        else:
+            error = str(exc)
         logger.exception("COG merge failed for layer %s", layer_id)
         report_exception(layer_id=layer_id)
         try:
+            db.rollback()
             layer = db.query(Covariate).filter(Covariate.id == layer_id).first()
             if layer:
                 layer.status = "failed"
-                layer.error_message = str(exc)[:2000]
+                layer.error_message = error[:2000]
                 layer.completed_at = datetime.now(timezone.utc)
                 db.commit()
         except Exception:
             db.rollback()
-        return {"status": "failed", "error": str(exc)[:500]}
+        return {"status": "failed", "error": error[:500]}
     finally:
         db.close()
 
@@ -133,6 +166,7 @@ def poll_gee_exports() -> dict:
             return {"checked": 0, "updated": 0}
 
         _auto_merge_ids: list[str] = []  # collect exports to auto-merge
+        _newly_exported: list = []  # tile URLs are listed after the loop
 
         import base64
 
@@ -183,16 +217,7 @@ def poll_gee_exports() -> dict:
                     if new_status in ("exported", "failed", "cancelled"):
                         export.completed_at = datetime.now(timezone.utc)
                     if new_status == "exported":
-                        from services import list_export_tiles
-
-                        tile_urls = list_export_tiles(
-                            export.gcs_bucket,
-                            export.gcs_prefix,
-                            export.covariate_name,
-                        )
-                        meta = dict(export.extra_metadata or {})
-                        meta["tile_urls"] = tile_urls
-                        export.extra_metadata = meta
+                        _newly_exported.append(export)
 
                         # Auto-trigger COG merge now that tiles are ready
                         export.status = "pending_merge"
@@ -216,6 +241,24 @@ def poll_gee_exports() -> dict:
                 )
                 report_exception(gee_task_id=export.gee_task_id)
 
+        # Record tile URLs for completed exports with one GCS listing per
+        # (bucket, prefix) rather than one per covariate.
+        if _newly_exported:
+            from services import list_export_tiles_batch
+
+            groups: dict[tuple, list] = {}
+            for export in _newly_exported:
+                key = (export.gcs_bucket, export.gcs_prefix)
+                groups.setdefault(key, []).append(export)
+            for (bucket, prefix), exports in groups.items():
+                tiles = list_export_tiles_batch(
+                    bucket, prefix, [e.covariate_name for e in exports],
+                )
+                for export in exports:
+                    meta = dict(export.extra_metadata or {})
+                    meta["tile_urls"] = tiles.get(export.covariate_name, [])
+                    export.extra_metadata = meta
+
         db.commit()
 
         # Dispatch COG merges for any exports that just completed
@@ -253,30 +296,21 @@ def auto_merge_unmerged() -> dict:
     dict
         ``{"scanned": N, "dispatched": N}``
     """
-    import importlib.util
     from datetime import datetime, timezone
 
     from config import Config
     from models import Covariate, get_db
+    from services import GEE_CONFIG_PATH, load_gee_config
 
     if not Config.GCS_BUCKET:
         return {"scanned": 0, "dispatched": 0}
 
     # Load covariate names from GEE export config
-    import os
-
-    gee_config_path = os.path.join(
-        os.path.dirname(__file__), "gee-export", "config.py"
-    )
-    if not os.path.exists(gee_config_path):
-        logger.warning("GEE config not found at %s", gee_config_path)
+    try:
+        gee_config = load_gee_config()
+    except FileNotFoundError:
+        logger.warning("GEE config not found at %s", GEE_CONFIG_PATH)
         return {"scanned": 0, "dispatched": 0}
-
-    spec = importlib.util.spec_from_file_location(
-        "gee_export_config", gee_config_path
-    )
-    gee_config = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(gee_config)
     known_covariates = list(gee_config.COVARIATES.keys())
 
     # Scan GCS for tile counts